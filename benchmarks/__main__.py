@@ -0,0 +1,44 @@
+"""
+Measure resolver and dependency overhead of fast_graphene.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --compare results.json --filter dependencies
+    python -m benchmarks --memory --filter large
+"""
+
+import sys
+from argparse import ArgumentParser
+
+from .cases import case_names
+from .runner import compare, dump, load, run_benchmarks
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--output", help="Write JSON result to file.")
+    parser.add_argument("--compare", help="JSON result of a baseline to compare.")
+    parser.add_argument("--filter", default="", help="Run cases containing it.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--memory", action="store_true", help="Measure peak memory and GC too."
+    )
+    parser.add_argument("--list", action="store_true", help="List cases and exit.")
+    args = parser.parse_args(argv)
+
+    names = [name for name in case_names() if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    report = run_benchmarks(
+        names, repeat=args.repeat, warmup=args.warmup, memory=args.memory
+    )
+    dump(report, args.output)
+    if args.compare:
+        print("\n".join(compare(load(args.compare), report)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+from inspect import Parameter, Signature
+from typing import Callable, Dict, List, NamedTuple
+
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn
+
+
+class Case(NamedTuple):
+    schema: gpt.Schema
+    query: str
+    fields: int  # Resolver calls per execution
+
+
+CASES: Dict[str, Callable[[], Case]] = {}
+
+
+def case(name: str):
+    def register(setup: Callable[[], Case]):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def list_schema(item_type: type, size: int) -> gpt.Schema:
+    class Query(gpt.ObjectType):
+        items = gpt.List(item_type)
+
+        def resolve_items(parent, info):
+            return list(range(size))
+
+    return gpt.Schema(Query)
+
+
+def with_dependencies(
+    func: Callable,
+    dependencies: Dict[str, Callable],
+    return_annotation=Signature.empty,
+) -> Callable:
+    """Give function a signature declaring dependencies, as if written by hand."""
+    func.__signature__ = Signature(
+        [
+            Parameter("parent", Parameter.POSITIONAL_OR_KEYWORD),
+            Parameter("info", Parameter.POSITIONAL_OR_KEYWORD),
+        ]
+        + [
+            Parameter(name, Parameter.KEYWORD_ONLY, default=DependOn(dependency))
+            for name, dependency in dependencies.items()
+        ],
+        return_annotation=return_annotation,
+    )
+    return func
+
+
+def make_dependency(kind: str, name: str, dependencies: Dict[str, Callable]):
+    if kind == "sync":
+
+        def dependency(parent, info, **kwargs):
+            return 1
+
+    elif kind == "async":
+
+        async def dependency(parent, info, **kwargs):
+            return 1
+
+    elif kind == "generator":
+
+        def dependency(parent, info, **kwargs):
+            yield 1
+
+    else:
+        raise ValueError(f'Unknown dependency kind "{kind}".')
+
+    dependency.__name__ = dependency.__qualname__ = name
+    return with_dependencies(dependency, dependencies)
+
+
+def make_dependency_tree(kind: str, depth: int, width: int) -> Dict[str, Callable]:
+    """Dependencies of ``width`` functions per level, each using the whole lower level."""
+    lower: Dict[str, Callable] = {}
+    for level in range(depth, 0, -1):
+        lower = {
+            f"dep_{level}_{num}": make_dependency(kind, f"dep_{level}_{num}", lower)
+            for num in range(width)
+        }
+    return lower
+
+
+LIST_SIZE = 100
+LARGE_LIST_SIZE = 5000
+
+
+@case(f"plain_graphene_list_{LIST_SIZE}")
+def plain_graphene_list() -> Case:
+    class Item(gpt.ObjectType):
+        value = gpt.Int()
+
+        def resolve_value(parent, info):
+            return parent
+
+    return Case(list_schema(Item, LIST_SIZE), "{ items { value } }", LIST_SIZE)
+
+
+@case(f"plain_graphene_async_list_{LIST_SIZE}")
+def plain_graphene_async_list() -> Case:
+    class Item(gpt.ObjectType):
+        value = gpt.Int()
+
+        async def resolve_value(parent, info):
+            return parent
+
+    return Case(list_schema(Item, LIST_SIZE), "{ items { value } }", LIST_SIZE)
+
+
+def double(parent, info) -> int:
+    return parent * 2
+
+
+def builder_list(
+    size: int, is_async: bool, pool_channels: bool = False, dependency: bool = False
+) -> Case:
+    builder = Builder(pool_channels=pool_channels)
+
+    if dependency:
+        # Fields without dependencies make no channel, pooled or not.
+        async def value(parent, info, doubled=DependOn(double)) -> int:
+            return doubled
+
+    elif is_async:
+
+        async def value(parent, info) -> int:
+            return parent
+
+    else:
+
+        def value(parent, info) -> int:
+            return parent
+
+    Item = type("Item", (gpt.ObjectType,), {"value": builder.field(value)})
+    return Case(list_schema(Item, size), "{ items { value } }", size)
+
+
+@case(f"builder_sync_list_{LIST_SIZE}")
+def builder_sync_list() -> Case:
+    return builder_list(LIST_SIZE, is_async=False)
+
+
+@case(f"builder_async_list_{LIST_SIZE}")
+def builder_async_list() -> Case:
+    return builder_list(LIST_SIZE, is_async=True)
+
+
+@case(f"builder_async_list_{LARGE_LIST_SIZE}")
+def builder_async_large_list() -> Case:
+    return builder_list(LARGE_LIST_SIZE, is_async=True)
+
+
+@case(f"builder_async_dependency_list_{LARGE_LIST_SIZE}")
+def builder_async_dependency_large_list() -> Case:
+    return builder_list(LARGE_LIST_SIZE, is_async=True, dependency=True)
+
+
+@case(f"builder_pooled_async_dependency_list_{LARGE_LIST_SIZE}")
+def builder_pooled_async_dependency_large_list() -> Case:
+    return builder_list(
+        LARGE_LIST_SIZE, is_async=True, pool_channels=True, dependency=True
+    )
+
+
+def dependency_tree_case(kind: str, depth: int, width: int) -> Callable[[], Case]:
+    def setup() -> Case:
+        builder = Builder()
+
+        async def value(parent, info, **kwargs) -> int:
+            return parent
+
+        value = with_dependencies(value, make_dependency_tree(kind, depth, width), int)
+        Item = type("Item", (gpt.ObjectType,), {"value": builder.field(value)})
+        return Case(list_schema(Item, LIST_SIZE), "{ items { value } }", LIST_SIZE)
+
+    return setup
+
+
+for _kind in ("sync", "async", "generator"):
+    for _depth, _width in ((1, 1), (1, 5), (3, 3), (5, 2)):
+        case(f"dependencies_{_kind}_depth{_depth}_width{_width}")(
+            dependency_tree_case(_kind, _depth, _width)
+        )
+
+
+def case_names() -> List[str]:
+    return list(CASES)
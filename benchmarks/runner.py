@@ -0,0 +1,143 @@
+import gc
+import json
+import platform
+import subprocess
+import tracemalloc
+from asyncio import run
+from datetime import datetime, timezone
+from statistics import mean, median, stdev
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import graphene
+
+from .cases import CASES
+
+FORMAT_VERSION = 1
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def measure(name: str, repeat: int, warmup: int) -> Dict[str, Any]:
+    case = CASES[name]()
+
+    for _ in range(warmup):
+        result = await case.schema.execute_async(case.query)
+        if result.errors:
+            raise RuntimeError(f'Benchmark "{name}" failed: {result.errors}')
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = perf_counter()
+        await case.schema.execute_async(case.query)
+        timings.append(perf_counter() - start)
+
+    return {
+        "repeat": repeat,
+        "fields": case.fields,
+        "min": min(timings),
+        "median": median(timings),
+        "mean": mean(timings),
+        "stdev": stdev(timings) if len(timings) > 1 else 0.0,
+        "per_field_us": median(timings) / case.fields * 1e6,
+    }
+
+
+async def measure_memory(name: str, repeat: int, warmup: int) -> Dict[str, Any]:
+    """Peak memory of an execution and garbage collections it triggers."""
+    case = CASES[name]()
+    for _ in range(warmup):
+        await case.schema.execute_async(case.query)
+
+    peaks: List[int] = []
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            await case.schema.execute_async(case.query)
+            peaks.append(tracemalloc.get_traced_memory()[1] - start)
+    finally:
+        tracemalloc.stop()
+    collections = gc.get_stats()[0]["collections"] - collections
+
+    return {
+        "peak_bytes": median(peaks),
+        "peak_bytes_per_field": median(peaks) / case.fields,
+        "gc_collections": collections / repeat,
+    }
+
+
+def run_benchmarks(
+    names: Iterable[str], repeat: int = 20, warmup: int = 3, memory: bool = False
+) -> Dict[str, Any]:
+    results = {}
+    for name in names:
+        results[name] = run(measure(name, repeat, warmup))
+        if memory:
+            results[name]["memory"] = run(measure_memory(name, repeat, warmup))
+
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "graphene": graphene.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[str]:
+    """Lines comparing median times, marking changes beyond threshold."""
+    lines = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            lines.append(f"{name:<45} new")
+            continue
+        ratio = result["median"] / baseline["results"][name]["median"]
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "slower"
+        elif ratio < 1 - threshold:
+            mark = "faster"
+        lines.append(f"{name:<45} {ratio:>6.2f}x {mark}")
+
+        baseline_memory = baseline["results"][name].get("memory")
+        if "memory" in result and baseline_memory:
+            ratio = result["memory"]["peak_bytes"] / baseline_memory["peak_bytes"]
+            lines.append(f"{'  peak memory':<45} {ratio:>6.2f}x")
+    return lines
+
+
+def dump(report: Dict[str, Any], path: Optional[str]):
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as file:
+        report = json.load(file)
+    if report.get("version") != FORMAT_VERSION:
+        raise ValueError(f'Benchmark result "{path}" has unsupported version.')
+    return report
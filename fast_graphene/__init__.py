@@ -1,16 +1,95 @@
-from .builder import Builder
-from .param_collector import DependOn
+"""
+Attributes are imported on first access, so that ``import fast_graphene``
+does not pull in graphene until a part needing it is used.
+"""
 
-_DEFAULT_BUILDER = Builder()
+from importlib import import_module
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .artifact import ArtifactError, SchemaArtifact
+    from .builder import Builder
+    from .cache import CachePolicy, FieldCache
+    from .cost import FieldCost, QueryCostAnalyzer, QueryCostError
+    from .deadlines import deadline, DeadlineExceeded
+    from .dependencies import RequestScope
+    from .limits import ConcurrencyLimit
+    from .param_collector import BatchDependOn, DependOn
+    from .profiling import Profiler
+    from .selection import get_selection, Selection
+    from .teardown import TeardownPolicy
+    from .tracing import Tracer
+
+    field = Builder().field
+    resolver = Builder().resolver
+    mutation = Builder().mutation
+    subscription = Builder().subscription
+
+_LAZY_ATTRIBUTES = {
+    "ArtifactError": "artifact",
+    "SchemaArtifact": "artifact",
+    "Builder": "builder",
+    "CachePolicy": "cache",
+    "FieldCache": "cache",
+    "FieldCost": "cost",
+    "QueryCostAnalyzer": "cost",
+    "QueryCostError": "cost",
+    "deadline": "deadlines",
+    "DeadlineExceeded": "deadlines",
+    "RequestScope": "dependencies",
+    "ConcurrencyLimit": "limits",
+    "BatchDependOn": "param_collector",
+    "DependOn": "param_collector",
+    "Profiler": "profiling",
+    "Selection": "selection",
+    "get_selection": "selection",
+    "TeardownPolicy": "teardown",
+    "Tracer": "tracing",
+}
+
+_DEFAULT_BUILDER_ATTRIBUTES = ("field", "resolver", "mutation", "subscription")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module = import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        globals()[name] = getattr(module, name)
+    elif name in _DEFAULT_BUILDER_ATTRIBUTES:
+        # Made once any of them is used, not on import.
+        default_builder = __getattr__("Builder")()
+        for attr in _DEFAULT_BUILDER_ATTRIBUTES:
+            globals()[attr] = getattr(default_builder, attr)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(__all__)
 
-field = _DEFAULT_BUILDER.field
-resolver = _DEFAULT_BUILDER.resolver
-mutation = _DEFAULT_BUILDER.mutation
 
 __all__ = [
+    "ArtifactError",
+    "BatchDependOn",
     "Builder",
+    "CachePolicy",
+    "ConcurrencyLimit",
+    "DeadlineExceeded",
     "DependOn",
+    "FieldCache",
+    "FieldCost",
+    "Profiler",
+    "QueryCostAnalyzer",
+    "QueryCostError",
+    "RequestScope",
+    "SchemaArtifact",
+    "Selection",
+    "TeardownPolicy",
+    "Tracer",
+    "deadline",
     "field",
+    "get_selection",
     "resolver",
     "mutation",
+    "subscription",
 ]
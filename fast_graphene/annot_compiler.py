@@ -1,17 +1,28 @@
-from copy import deepcopy
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from inspect import isfunction
-from typing import Dict, get_args, get_origin, List, Optional, Type, Union
+from typing import (
+    Dict,
+    get_args,
+    get_origin,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from graphene import types as gpt
 
+from .inputs import compile_input_type, is_input_class
 from .types import (
     Annotation,
     AnnotCompileFunc,
     AnnotCompileResult,
     Context,
+    ContextEnum,
     GrapheneType,
 )
 from .utils import GrapheneTypeTreeNode
@@ -76,16 +87,31 @@ DEFAULT_SUBCLS_ANNOT_MAP = {
 }
 
 
+# Canonical graphene type of python classes compiled with "subcls_annot_map",
+# by class and compile function. Shared by every compiler, so one python Enum
+# never becomes two graphene Enums, while a compiler mapping the class to its
+# own compile function still gets what that makes.
+TYPE_REGISTRY: Dict[Tuple[type, AnnotCompileFunc], GrapheneType] = {}
+
+# InputObjectType of dataclasses, NamedTuples and TypedDicts, kept apart from
+# TYPE_REGISTRY as the same class may not be used as an output type. Fields are
+# compiled with both maps, so it is shared only by compilers using the defaults.
+INPUT_TYPE_REGISTRY: Dict[type, GrapheneType] = {}
+
+
 class AnnotCompiler:
     def __init__(
         self,
         annot_map=None,
         subcls_annot_map=None,
+        type_registry: Optional[
+            Dict[Tuple[type, AnnotCompileFunc], GrapheneType]
+        ] = None,
     ):
         self.annot_map: Dict[
             Annotation,
             Union[AnnotCompileFunc, GrapheneType],
-        ] = deepcopy(DEFAULT_ANNOT_MAP)
+        ] = dict(DEFAULT_ANNOT_MAP)
         if annot_map:
             self.annot_map.update(annot_map)
         self.subcls_annot_map: Dict[
@@ -94,16 +120,36 @@ class AnnotCompiler:
                 AnnotCompileFunc,
                 Union[AnnotCompileFunc, GrapheneType],
             ],
-        ] = deepcopy(DEFAULT_SUBCLS_ANNOT_MAP)
-        if annot_map:
+        ] = dict(DEFAULT_SUBCLS_ANNOT_MAP)
+        if subcls_annot_map:
             self.subcls_annot_map.update(subcls_annot_map)
+        self.type_registry = TYPE_REGISTRY if type_registry is None else type_registry
+        self.input_registry: Dict[type, GrapheneType] = (
+            INPUT_TYPE_REGISTRY
+            if type_registry is None and not (annot_map or subcls_annot_map)
+            else {}
+        )
+        self._parent_class_cache: Dict[type, Optional[type]] = {}
+        self._cache: Dict[Tuple[Hashable, Hashable], GrapheneType] = {}
 
     def _parent_class_finder(self, cls: type) -> Optional[type]:
-        for parent in self.subcls_annot_map.keys():
-            if issubclass(cls, parent):
-                return parent
+        if cls in self._parent_class_cache:
+            return self._parent_class_cache[cls]
+
+        # The most specific class in MRO wins.
+        for parent in getattr(cls, "__mro__", ()):
+            if parent in self.subcls_annot_map:
+                break
         else:
-            return None
+            # Virtual subclasses registered with ABCMeta are not in MRO.
+            for parent in self.subcls_annot_map.keys():
+                if issubclass(cls, parent):
+                    break
+            else:
+                parent = None
+
+        self._parent_class_cache[cls] = parent
+        return parent
 
     def compile_as_node(
         self,
@@ -114,13 +160,19 @@ class AnnotCompiler:
         origin = get_origin(annotation) or annotation
         args_origin = get_args(annotation)
         compiler = None
+        canonical = False
 
         if isinstance(origin, type):
             compiler = self.subcls_annot_map.get(self._parent_class_finder(origin))
+            canonical = compiler is not None and not args_origin
+            if canonical and (origin, compiler) in self.type_registry:
+                return GrapheneTypeTreeNode(self.type_registry[(origin, compiler)])
         if not compiler:
             compiler = self.annot_map.get(origin)
 
-        if compiler is None:
+        if compiler is None and self._is_input(origin, context):
+            return GrapheneTypeTreeNode(self.compile_input(origin))
+        elif compiler is None:
             raise TypeError(
                 f'Cannot compile "{annotation}". Use "annot_map" and "subcls_annot_map" option.'
             )
@@ -130,6 +182,8 @@ class AnnotCompiler:
             node = GrapheneTypeTreeNode(compiler)
         elif isfunction(compiler):
             graphene_type, args = compiler(origin, args_origin, context=context)
+            if canonical and not args:
+                self.type_registry[(origin, compiler)] = graphene_type
             node = GrapheneTypeTreeNode(
                 graphene_type,
                 [
@@ -142,8 +196,34 @@ class AnnotCompiler:
 
         return node
 
+    @staticmethod
+    def _is_input(origin: Annotation, context: Optional[Context]) -> bool:
+        return (
+            isinstance(origin, type)
+            and context not in (ContextEnum.FIELD, ContextEnum.MUTATION)
+            and is_input_class(origin)
+        )
+
+    def compile_input(self, cls: type) -> GrapheneType:
+        try:
+            return self.input_registry[cls]
+        except KeyError:
+            pass
+        input_type = compile_input_type(cls, self.compile)
+        self.input_registry[cls] = input_type
+        return input_type
+
     def compile(
         self, annotation: Annotation, context: Optional[Context] = None
     ) -> GrapheneType:
-        node = self.compile_as_node(annotation, [], context=context)
-        return node.compile()
+        key = (annotation, context)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable annotation or context can't be cached.
+            return self.compile_as_node(annotation, [], context=context).compile()
+
+        compiled = self.compile_as_node(annotation, [], context=context).compile()
+        self._cache[key] = compiled
+        return compiled
@@ -0,0 +1,326 @@
+import json
+import marshal
+import sys
+from enum import Enum
+from hashlib import sha256
+from importlib import import_module
+from inspect import isfunction, signature
+from types import FunctionType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from graphene import types as gpt
+from graphene.types.structures import Structure
+
+from .annot_compiler import AnnotCompiler
+from .param_collector import DependOn, interpret_params
+from .types import ContextEnum, GrapheneType
+
+FORMAT_VERSION = 2
+
+InterpretResult = Tuple[Dict[str, gpt.Argument], Dict[str, DependOn]]
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+class Unrecordable(Exception):
+    """Raised for what cannot be written to, or read from, an artifact."""
+
+
+def func_key(func: Callable) -> Optional[str]:
+    """Key of function in artifact, or ``None`` if it cannot be recorded."""
+    # Closures of one function share a name but may differ in annotations,
+    # and a signature set by hand is not in the source.
+    if not isfunction(func) or hasattr(func, "__signature__"):
+        return None
+    if "<locals>" in func.__qualname__:
+        return None
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+PLAIN_TYPES = frozenset((type(None), bool, int, float, str, bytes))
+
+
+def type_key(type_: type) -> Tuple[str, str]:
+    return (type_.__module__, type_.__qualname__)
+
+
+def stable_value(value: Any, depth: int = 0) -> Any:
+    """
+    Value made only of what ``marshal`` takes, the same in every process,
+    unlike ``repr`` of functions and most objects giving their address.
+    """
+    type_ = type(value)
+    if type_ in PLAIN_TYPES:
+        return value
+    elif depth > 8:
+        return "..."
+    elif type_ is tuple or type_ is list:
+        return tuple([stable_value(item, depth + 1) for item in value])
+    elif type_ is dict:
+        return tuple(
+            [(key, stable_value(item, depth + 1)) for key, item in value.items()]
+        )
+    elif type_ is FunctionType or isinstance(value, type):
+        return type_key(value)
+    elif isinstance(value, Enum):
+        return (type_.__module__, type_.__qualname__, value._name_)
+
+    attrs = getattr(value, "__dict__", None)
+    if attrs is None:
+        attrs = {
+            name: getattr(value, name)
+            for cls in type_.__mro__
+            for name in getattr(cls, "__slots__", ())
+            if hasattr(value, name)
+        }
+    return (type_.__module__, type_.__qualname__, stable_value(attrs, depth + 1))
+
+
+def func_hash(func: Callable) -> str:
+    """
+    Hash of what signature and body of function are made of. Unlike hash of
+    its source, it takes no file access to compute.
+    """
+    code = func.__code__
+    return sha256(
+        marshal.dumps(
+            (
+                code.co_code,
+                code.co_consts,
+                code.co_names,
+                code.co_varnames,
+                stable_value(
+                    (func.__defaults__, func.__kwdefaults__, func.__annotations__)
+                ),
+            )
+        )
+    ).hexdigest()
+
+
+def type_ref(type_: type) -> str:
+    ref = f"{type_.__module__}:{type_.__qualname__}"
+    try:
+        found = resolve_ref(ref)
+    except Unrecordable:
+        found = None
+    if found is not type_:
+        raise Unrecordable(f'"{type_}" cannot be imported by its name.')
+    return ref
+
+
+def resolve_ref(ref: str) -> Any:
+    module_name, _, qualname = ref.partition(":")
+    try:
+        # Looked up first, as import_module costs more than the rest of it.
+        obj = sys.modules.get(module_name) or import_module(module_name)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as exc:
+        raise Unrecordable(f'"{ref}" cannot be imported.') from exc
+    return obj
+
+
+def dump_type(type_: GrapheneType) -> Any:
+    if isinstance(type_, Structure):  # gpt.NonNull, gpt.List
+        return {type(type_).__name__: dump_type(type_.of_type)}
+    elif not isinstance(type_, type):
+        raise Unrecordable(f'"{type_}" is not a type.')
+    elif issubclass(type_, gpt.Enum) and getattr(type_._meta, "enum", None):
+        try:
+            return type_ref(type_)
+        except Unrecordable:
+            # Made from a python Enum by AnnotCompiler.
+            return {"Enum": type_ref(type_._meta.enum)}
+    elif issubclass(type_, gpt.InputObjectType) and hasattr(type_, "input_class"):
+        # Made from a dataclass, NamedTuple or TypedDict by AnnotCompiler.
+        return {"Input": type_ref(type_.input_class)}
+    else:
+        return type_ref(type_)
+
+
+def load_type(expr: Any, annot_compiler: AnnotCompiler) -> GrapheneType:
+    if isinstance(expr, str):
+        return resolve_ref(expr)
+    ((kind, of),) = expr.items()
+    if kind == "NonNull":
+        return gpt.NonNull(load_type(of, annot_compiler))
+    elif kind == "List":
+        return gpt.List(load_type(of, annot_compiler))
+    elif kind in ("Enum", "Input"):
+        return annot_compiler.compile(resolve_ref(of))
+    raise Unrecordable(f'Unknown type "{kind}".')
+
+
+def param_defaults(func: Callable) -> Dict[str, Any]:
+    """Default values of parameters, read without ``signature()``."""
+    code = func.__code__
+    positional = code.co_varnames[: code.co_argcount]
+    defaults = dict(zip(positional[::-1], (func.__defaults__ or ())[::-1]))
+    defaults.update(func.__kwdefaults__ or {})
+    return defaults
+
+
+class SchemaArtifact:
+    """
+    What ``Builder`` computes from signatures of resolvers and dependencies:
+    arguments, dependencies and return types, saved to skip that work on the
+    next start, e.g.::
+
+        artifact = SchemaArtifact.load("schema.json", missing_ok=True)
+        builder = Builder(artifact=artifact)
+        ...  # Define types and build schema.
+        artifact.dump("schema.json", schema)
+
+    Functions are checked against hash of their code when compiled, and
+    ``ArtifactError`` is raised for one changed since the artifact was made.
+    Functions the artifact does not know are compiled as usual.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Dict[str, Dict[str, Any]]] = None,
+        sdl: Optional[str] = None,
+    ):
+        self.records = records or {}
+        self.sdl = sdl
+        self.hits = 0
+        self._used: Set[str] = set()
+        self._checked: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: str, missing_ok: bool = False) -> "SchemaArtifact":
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            if missing_ok:
+                return cls()
+            raise
+
+        if data.get("version") != FORMAT_VERSION:
+            raise ArtifactError(f'Artifact "{path}" has unsupported version.')
+        elif data.get("python") != sys.implementation.cache_tag:
+            # Hashes are of bytecode, which differs between interpreters.
+            return cls()
+        return cls(data["functions"], data.get("sdl"))
+
+    def dump(self, path: str, schema: Union[None, gpt.Schema] = None):
+        """Write records of functions compiled in this process."""
+        data = {
+            "version": FORMAT_VERSION,
+            "python": sys.implementation.cache_tag,
+            "functions": {key: self.records[key] for key in sorted(self._used)},
+            "sdl": str(schema) if schema is not None else self.sdl,
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+            file.write("\n")
+
+    def _record(self, func: Callable) -> Optional[Dict[str, Any]]:
+        key = func_key(func)
+        if key is None:
+            return None
+
+        if key not in self._checked:
+            hash_ = func_hash(func)
+            record = self.records.get(key)
+            if record is not None and record["hash"] != hash_:
+                raise ArtifactError(
+                    f'Function "{key}" changed since the artifact was made.'
+                )
+            elif record is None:
+                self.records[key] = {"hash": hash_}
+            self._checked.add(key)
+
+        self._used.add(key)
+        return self.records[key]
+
+    def interpret(
+        self, func: Callable, annot_compiler: Optional[AnnotCompiler] = None
+    ) -> InterpretResult:
+        """``interpret_params`` answered from artifact when possible."""
+        annot_compiler = annot_compiler or AnnotCompiler()
+        record = self._record(func)
+        if record is not None and "arguments" in record:
+            try:
+                result = self._load_params(func, record, annot_compiler)
+            except Unrecordable:
+                pass
+            else:
+                self.hits += 1
+                return result
+
+        args, depend_ons = interpret_params(func, annot_compiler=annot_compiler)
+        if record is not None:
+            try:
+                record.update(self._dump_params(func, args, depend_ons))
+            except Unrecordable:
+                pass
+        return args, depend_ons
+
+    def return_type(
+        self, func: Callable, annot_compiler: Optional[AnnotCompiler] = None
+    ) -> GrapheneType:
+        annot_compiler = annot_compiler or AnnotCompiler()
+        record = self._record(func)
+        if record is not None and "return_type" in record:
+            try:
+                type_ = load_type(record["return_type"], annot_compiler)
+            except Unrecordable:
+                pass
+            else:
+                self.hits += 1
+                return type_
+
+        type_ = annot_compiler.compile(
+            signature(func).return_annotation, ContextEnum.FIELD
+        )
+        if record is not None:
+            try:
+                record["return_type"] = dump_type(type_)
+            except Unrecordable:
+                pass
+        return type_
+
+    @staticmethod
+    def _dump_params(
+        func: Callable,
+        args: Dict[str, gpt.Argument],
+        depend_ons: Dict[str, DependOn],
+    ) -> Dict[str, Any]:
+        defaults = param_defaults(func)
+        arguments: List[Tuple[str, Dict[str, Any]]] = []
+        for name, argument in args.items():
+            if defaults.get(name) is argument:  # Given by hand.
+                arguments.append((name, {"given": True}))
+                continue
+
+            spec = {"type": dump_type(argument.type)}
+            if name in defaults:
+                default = defaults[name]
+                if json.loads(json.dumps(default, default=repr)) != default:
+                    raise Unrecordable(f'Default of "{name}" does not survive JSON.')
+                spec["default_value"] = default
+            arguments.append((name, spec))
+        return {"arguments": arguments, "dependencies": list(depend_ons)}
+
+    @staticmethod
+    def _load_params(
+        func: Callable, record: Dict[str, Any], annot_compiler: AnnotCompiler
+    ) -> InterpretResult:
+        defaults = param_defaults(func)
+        args = {}
+        for name, spec in record["arguments"]:
+            if spec.get("given"):
+                args[name] = defaults[name]
+            elif "default_value" in spec:
+                args[name] = gpt.Argument(
+                    load_type(spec["type"], annot_compiler),
+                    default_value=spec["default_value"],
+                )
+            else:
+                args[name] = gpt.Argument(load_type(spec["type"], annot_compiler))
+        depend_ons = {name: defaults[name] for name in record["dependencies"]}
+        return args, depend_ons
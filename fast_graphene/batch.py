@@ -0,0 +1,64 @@
+from asyncio import Future, get_running_loop, Task
+from inspect import isawaitable
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class BatchLoader:
+    """
+    Collects keys requested in the same event loop tick and loads them with one
+    call of batch function. Batch function gets list of unique keys and must
+    return results in the same order.
+    """
+
+    def __init__(self, batch_func: Callable, cache: bool = False):
+        self.batch_func = batch_func
+        self.cache: Optional[Dict[Hashable, Future]] = {} if cache else None
+        self.pending: List[Tuple[Hashable, Future]] = []
+        # Event loop keeps only weak references to tasks.
+        self.tasks: Set[Task] = set()
+
+    def load(self, key: Hashable) -> Future:
+        if self.cache is not None and key in self.cache:
+            return self.cache[key]
+
+        loop = get_running_loop()
+        future = loop.create_future()
+        if not self.pending:
+            loop.call_soon(self.start_dispatch)
+        self.pending.append((key, future))
+
+        if self.cache is not None:
+            self.cache[key] = future
+        return future
+
+    def start_dispatch(self):
+        task = get_running_loop().create_task(self.dispatch())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def dispatch(self):
+        pending, self.pending = self.pending, []
+        try:
+            # In here, so that unhashable keys fail every future waiting.
+            keys = list(dict.fromkeys(key for key, _ in pending))
+            results = self.batch_func(keys)
+            if isawaitable(results):
+                results = await results
+            results = list(results)
+            if len(results) != len(keys):
+                raise ValueError(
+                    f'Batch function "{self.batch_func}" returned {len(results)} '
+                    f"results for {len(keys)} keys."
+                )
+        except Exception as exc:
+            for key, future in pending:
+                if self.cache is not None:
+                    self.cache.pop(key, None)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        result_map: Dict[Hashable, Any] = dict(zip(keys, results))
+        for key, future in pending:
+            if not future.done():
+                future.set_result(result_map[key])
@@ -1,19 +1,68 @@
-from asyncio import create_task, gather, get_running_loop
+import collections.abc
+from asyncio import get_running_loop
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import wait_for
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 from decimal import Decimal
 from functools import partial, wraps
-from inspect import iscoroutinefunction, signature
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type, Union
+from inspect import isasyncgenfunction, iscoroutinefunction, signature
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    get_args,
+    get_origin,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from graphene import types as gpt
 
-from fast_graphene.dependencies import Dependency, DependencyChannel
+from fast_graphene.dependencies import (
+    AppScope,
+    build_dependency_tree,
+    ChannelPool,
+    Dependency,
+    DependencyChannel,
+    get_request_scope,
+)
 
 from .annot_compiler import AnnotCompiler
-from .param_collector import interpret_params, pick_used_params_only
-from .types import ContextEnum
+from .artifact import SchemaArtifact
+from .cache import FieldCache
+from .codegen import make_execute, make_sync_execute
+from .cost import CostValue, FieldCost
+from .deadlines import DeadlineExceeded, time_left
+from .executors import check_process_func, ProcessPool
+from .fields import FieldCompileResult, LazyField, SubscriptionField
+from .limits import ConcurrencyLimit
+from .param_collector import pick_used_params_only
+from .profiling import Profiler
+from .subscriptions import compile_subscription
+from .teardown import TeardownPolicy
+from .tracing import Tracer
+from .types import (
+    ContextEnum,
+    ExecutionEnum,
+    GrapheneType,
+    OverflowEnum,
+    ScopeEnum,
+    TeardownEnum,
+)
 from .utils import SetDict
 
+STREAM_ORIGINS = (
+    collections.abc.AsyncGenerator,
+    collections.abc.AsyncIterable,
+    collections.abc.AsyncIterator,
+)
+
 DEFAULT_SCALAR_MAP = {
     int: gpt.Int,
     float: gpt.Float,
@@ -25,45 +74,265 @@ DEFAULT_SCALAR_MAP = {
 }
 
 
+def trace_executor(func: Callable, tracer: Tracer) -> Callable:
+    """Executor of resolver emitting spans of thread pool wait and resolver."""
+    if iscoroutinefunction(func):
+
+        async def traced(parent: Any, info: gpt.ResolveInfo, **kwargs):
+            with tracer.span("resolver", func, info, parent):
+                return await func(parent, info, **kwargs)
+
+        return traced
+
+    def traced_in_executor(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        wait = tracer.start("executor", func, info, parent)
+
+        def run():
+            tracer.end(wait)
+            with tracer.span("resolver", func, info, parent):
+                return func(parent, info, **kwargs)
+
+        return get_running_loop().run_in_executor(None, run)
+
+    return traced_in_executor
+
+
+def thread_executor(func: Callable) -> Callable:
+    """Executor of sync resolver running it in the default thread pool."""
+
+    # Loop is looked up on call, so that resolvers compile without one.
+    def run_in_thread(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        return get_running_loop().run_in_executor(
+            None, partial(func, parent, info, **kwargs)
+        )
+
+    return run_in_thread
+
+
+def process_executor(
+    func: Callable, process_pool: ProcessPool, tracer: Optional[Tracer] = None
+) -> Callable:
+    """Executor of resolver running it in process pool with plain arguments."""
+    check_process_func(func)
+
+    async def run_in_process(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        if tracer is None:
+            return await process_pool.run(func, kwargs)
+        with tracer.span("resolver", func, info, parent):
+            return await process_pool.run(func, kwargs)
+
+    return run_in_process
+
+
+def limit_executor(executor: Callable, limit: ConcurrencyLimit) -> Callable:
+    """Executor of resolver waiting for a slot of limit first."""
+
+    async def limited(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        async with limit:
+            return await executor(parent, info, **kwargs)
+
+    return limited
+
+
+def within_deadline(resolve: Callable, timeout: Optional[float]) -> Callable:
+    """
+    Cancels resolve, with every dependency it waits for, once ``timeout`` or
+    deadline of the operation is over.
+    """
+
+    async def resolve_within_deadline(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        seconds = time_left(timeout)
+        if seconds is None:
+            return await resolve(parent, info, **kwargs)
+        elif seconds <= 0:
+            raise DeadlineExceeded(f'Deadline exceeded before "{info.field_name}".')
+
+        expires_at = monotonic() + seconds
+        try:
+            return await wait_for(resolve(parent, info, **kwargs), seconds)
+        except AsyncTimeoutError:
+            # Also TimeoutError on python 3.11+, which resolvers raise themselves.
+            if monotonic() < expires_at:
+                raise
+            raise DeadlineExceeded(
+                f'Deadline exceeded while resolving "{info.field_name}".'
+            ) from None
+
+    return resolve_within_deadline
+
+
+def profiled_execute(
+    func: Callable,
+    executor: Callable,
+    dependency: Dependency,
+    profiler: Optional[Profiler] = None,
+    tracer: Optional[Tracer] = None,
+    teardown: Optional[TeardownPolicy] = None,
+    app_scope: Optional[AppScope] = None,
+    field_cache: Optional[FieldCache] = None,
+    channel_pool: Optional[ChannelPool] = None,
+) -> Callable:
+    """
+    Execute of resolver needing its arguments and dependency values as dicts,
+    to record them in profile or to key cache with them.
+    """
+    teardown = teardown or TeardownPolicy()
+    plan = dependency.plan
+    used_arg_names = tuple(dependency.arguments.keys())
+    size = dependency.tree_size
+
+    async def execute(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        profile = profiler.current() if profiler is not None else None
+        if channel_pool is None:
+            channel = DependencyChannel(
+                size,
+                parent,
+                info=info,
+                scope=get_request_scope(info),
+                app_scope=app_scope,
+                profile=profile,
+                tracer=tracer,
+                **kwargs,
+            )
+        else:
+            channel = channel_pool.acquire(
+                size,
+                parent,
+                info,
+                get_request_scope(info),
+                app_scope,
+                profile,
+                tracer,
+                kwargs,
+            )
+        args_to_use = pick_used_params_only(used_arg_names, kwargs)
+        if profile is not None:
+            profile.record(func, "resolver", parent, args_to_use)
+
+        try:
+            # Execute Dependencies
+            await plan.run(channel)
+            resolved_dependencies = channel.values_of(dependency)
+            if field_cache is not None and field_cache.dependencies:
+                result = await field_cache.get(
+                    field_cache.make_key(parent, kwargs, resolved_dependencies),
+                    partial(
+                        executor, parent, info, **args_to_use, **resolved_dependencies
+                    ),
+                )
+            else:
+                result = await executor(
+                    parent, info, **args_to_use, **resolved_dependencies
+                )
+        finally:
+            # Release generators.
+            await teardown.release(channel)
+
+        # Only on success, as nothing else may refer to channel then.
+        if channel_pool is not None:
+            channel_pool.release(channel)
+        return result
+
+    return execute
+
+
 def compile_func(
     func: Callable,
-    used_arg_names: Iterable[str],
-    used_dependency_names: Iterable[str],
-    dependencies: Dict[str, Dependency],
+    dependency: Dependency,
+    profiler: Optional[Profiler] = None,
+    tracer: Optional[Tracer] = None,
+    teardown: Optional[TeardownPolicy] = None,
+    app_scope: Optional[AppScope] = None,
+    field_cache: Optional[FieldCache] = None,
+    limit: Optional[ConcurrencyLimit] = None,
+    timeout: Optional[float] = None,
+    process_pool: Optional[ProcessPool] = None,
+    channel_pool: Optional[ChannelPool] = None,
 ):
-    if not iscoroutinefunction(func):
-        loop = get_running_loop()
-        executor = partial(loop.run_in_executor, None, func)
+    if process_pool is not None:
+        executor = process_executor(func, process_pool, tracer)
+    elif tracer is not None:
+        executor = trace_executor(func, tracer)
+    elif not iscoroutinefunction(func):
+        executor = thread_executor(func)
     else:
         executor = func
+    if limit is not None:
+        executor = limit_executor(executor, limit)
+
+    if profiler is None and (field_cache is None or not field_cache.dependencies):
+        execute = make_execute(
+            executor, dependency, tracer, teardown, app_scope, channel_pool
+        )
+    else:
+        execute = profiled_execute(
+            func,
+            executor,
+            dependency,
+            profiler,
+            tracer,
+            teardown,
+            app_scope,
+            field_cache,
+            channel_pool,
+        )
+
+    if field_cache is not None:
+        field_cache.bind(func)
+
+    if field_cache is None or field_cache.dependencies:
+        resolve = execute
+    else:
+        # Checked before any dependency runs.
+        async def resolve(parent: Any, info: gpt.ResolveInfo, **kwargs):
+            return await field_cache.get(
+                field_cache.make_key(parent, kwargs),
+                partial(execute, parent, info, **kwargs),
+            )
+
+    resolve = within_deadline(resolve, timeout)
+
+    if tracer is None:
+        return wraps(func)(resolve)
 
     @wraps(func)
     async def compiled_func(parent: Any, info: gpt.ResolveInfo, **kwargs):
-        channel = DependencyChannel(dependencies.values(), parent, info=info, **kwargs)
-        args_to_use = pick_used_params_only(used_arg_names, kwargs)
+        with tracer.span("field", func, info, parent):
+            return await resolve(parent, info, **kwargs)
 
-        # To prevent leaf dependency called first.
-        dependencies_to_use = pick_used_params_only(used_dependency_names, dependencies)
-
-        # Execute Dependencies
-        gatherd = await gather(
-            *[
-                dependency(
-                    parent,
-                    info,
-                    pick_used_params_only(dependency.arguments.keys(), kwargs),
-                    channel=channel,
-                )
-                for dependency in dependencies_to_use.values()
-            ]
-        )
+    return compiled_func
 
-        # Release generators.
-        release = create_task(channel.release())
-        resolved_dependencies = dict(zip(dependencies_to_use.keys(), gatherd))
-        result = await executor(parent, info, **args_to_use, **resolved_dependencies)
-        await release
-        return result
+
+def compile_sync_func(
+    func: Callable,
+    dependency: Dependency,
+    profiler: Optional[Profiler] = None,
+    tracer: Optional[Tracer] = None,
+) -> Callable:
+    """
+    Resolver calling sync ``func`` and its dependencies in place, for
+    ``Schema.execute``. Needs no event loop, even to be compiled.
+    """
+    if iscoroutinefunction(func) or isasyncgenfunction(func):
+        raise TypeError(f'Resolver "{func}" must be sync in sync mode.')
+    dependency.plan.check_sync()
+
+    if tracer is None:
+        target = func
+    else:
+
+        def target(parent: Any, info: gpt.ResolveInfo, **kwargs):
+            with tracer.span("resolver", func, info, parent):
+                return func(parent, info, **kwargs)
+
+    execute = make_sync_execute(target, dependency, profiler, tracer)
+    if tracer is None:
+        return wraps(func)(execute)
+
+    @wraps(func)
+    def compiled_func(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        with tracer.span("field", func, info, parent):
+            return execute(parent, info, **kwargs)
 
     return compiled_func
 
@@ -73,14 +342,40 @@ class Builder:
         self,
         annot_map=None,
         subcls_annot_map=None,
+        profiler: Optional[Profiler] = None,
+        lazy: bool = False,
+        tracer: Optional[Tracer] = None,
+        teardown: Optional[TeardownPolicy] = None,
+        process_workers: Optional[int] = None,
+        pool_channels: bool = False,
+        artifact: Optional[SchemaArtifact] = None,
+        sync: bool = False,
     ):
+        teardown = teardown or TeardownPolicy()
+        if sync and teardown.mode is not TeardownEnum.INLINE:
+            raise ValueError("Sync mode releases generator dependencies inline only.")
         self.annot_compiler = AnnotCompiler(annot_map, subcls_annot_map)
+        self.profiler = profiler
+        self.tracer = tracer
+        self.teardown = teardown
+        self.app_scope = AppScope(tracer=tracer)
+        self.lazy = lazy
+        # Limits are shared by every field and tree using the function.
+        self.limits: Dict[Callable, ConcurrencyLimit] = {}
+        self.process_pool = ProcessPool(process_workers)
+        self.channel_pool = ChannelPool() if pool_channels else None
+        self.artifact = artifact
+        # Resolvers are plain functions, for "Schema.execute".
+        self.sync = sync
+        self._pending_fields: List[LazyField] = []
 
     def resolver(
         self,
         func: Optional[Callable] = None,
     ) -> Callable:
         def inner(func):
+            if self.lazy:
+                return self._lazy_resolver(func)
             compiled_func, _ = self._compile_func(func)
             return compiled_func
 
@@ -91,47 +386,278 @@ class Builder:
 
     mutation = resolver  # noqa
 
+    def _lazy_resolver(self, func: Callable) -> Callable:
+        compiled_func = None
+
+        @wraps(func)
+        def lazy_resolver(parent: Any, info: gpt.ResolveInfo, **kwargs):
+            nonlocal compiled_func
+            if compiled_func is None:
+                compiled_func, _ = self._compile_func(func)
+            return compiled_func(parent, info, **kwargs)
+
+        return lazy_resolver
+
+    def _get_limit(self, func: Callable, max_concurrency: int) -> ConcurrencyLimit:
+        limit = self.limits.get(func)
+        if limit is None:
+            limit = self.limits[func] = ConcurrencyLimit(max_concurrency)
+        elif limit.max_concurrency != max_concurrency:
+            raise ValueError(
+                f'"{func}" is limited to {limit.max_concurrency} concurrent calls '
+                f"already, not {max_concurrency}."
+            )
+        return limit
+
+    def _compile_sync_func(
+        self,
+        func: Callable,
+        dependency: Dependency,
+        cache: Optional[FieldCache] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
+    ) -> Callable:
+        # Each of them needs an event loop.
+        unsupported = {
+            "cache": cache is not None,
+            "max_concurrency": max_concurrency is not None,
+            "timeout": timeout is not None,
+            "execution": ExecutionEnum(execution) is not ExecutionEnum.DEFAULT,
+        }
+        for option, is_set in unsupported.items():
+            if is_set:
+                raise ValueError(
+                    f'"{option}" of "{func}" is not supported in sync mode.'
+                )
+        return compile_sync_func(func, dependency, self.profiler, self.tracer)
+
     def _compile_func(
-        self, func: Callable, extra_args: Optional[Dict[str, gpt.Argument]] = None
+        self,
+        func: Callable,
+        extra_args: Optional[Dict[str, gpt.Argument]] = None,
+        cache: Optional[FieldCache] = None,
+        cost: Union[None, CostValue, FieldCost] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
     ) -> Tuple[Callable, Dict[str, gpt.Argument]]:
         extra_args = extra_args or {}
 
-        args, depend_ons = interpret_params(func, annot_compiler=self.annot_compiler)
-        compiled_func = compile_func(
-            func, args.keys(), set(depend_ons.values()), depend_ons
+        tree = build_dependency_tree(
+            func, annot_compiler=self.annot_compiler, artifact=self.artifact
         )
-        args = SetDict(args)
+        for dependency in tree.flated_dependencies:
+            if dependency.max_concurrency is not None:
+                dependency.limit = self._get_limit(
+                    dependency.func, dependency.max_concurrency
+                )
+            if dependency.execution is ExecutionEnum.PROCESS:
+                dependency.process_pool = self.process_pool
+        if self.sync:
+            compiled_func = self._compile_sync_func(
+                func, tree.dependency, cache, max_concurrency, timeout, execution
+            )
+        else:
+            compiled_func = compile_func(
+                func,
+                tree.dependency,
+                profiler=self.profiler,
+                tracer=self.tracer,
+                teardown=self.teardown,
+                app_scope=self.app_scope,
+                field_cache=cache,
+                limit=(
+                    None
+                    if max_concurrency is None
+                    else self._get_limit(func, max_concurrency)
+                ),
+                timeout=timeout,
+                process_pool=(
+                    self.process_pool
+                    if ExecutionEnum(execution) is ExecutionEnum.PROCESS
+                    else None
+                ),
+                channel_pool=self.channel_pool,
+            )
+        if cost is not None:
+            # Read by QueryCostAnalyzer through the resolver of the field.
+            compiled_func.field_cost = (
+                cost if isinstance(cost, FieldCost) else FieldCost(cost)
+            )
+        for dependency in tree.flated_dependencies:
+            if dependency.scope is ScopeEnum.APP:
+                self.app_scope.register(dependency)
+        args = SetDict(tree.flated_arguments)
         args.update(extra_args)
 
         return compiled_func, args
 
-    def field(
+    def _compile_field(
+        self,
+        func: Callable,
+        extra_args: Optional[Dict[str, gpt.Argument]] = None,
+        return_type: Optional[GrapheneType] = None,
+        cache: Optional[FieldCache] = None,
+        cost: Union[None, CostValue, FieldCost] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
+    ) -> FieldCompileResult:
+        compiled_func, args = self._compile_func(
+            func,
+            extra_args=extra_args,
+            cache=cache,
+            cost=cost,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            execution=execution,
+        )
+
+        # Set graphene Field type(=return_type).
+        if return_type:
+            pass
+        elif self.artifact is not None:
+            return_type = self.artifact.return_type(func, self.annot_compiler)
+        else:
+            return_type = self.annot_compiler.compile(
+                signature(func).return_annotation, ContextEnum.FIELD
+            )
+
+        return compiled_func, args, return_type
+
+    def compile_pending(self):
+        """Compile every lazy field at once, e.g. before forking workers."""
+        for field in self._pending_fields:
+            field.compile()
+        self._pending_fields.clear()
+
+    async def startup(self):
+        """Set up app scoped dependencies once for the process."""
+        self.compile_pending()
+        await self.app_scope.startup()
+
+    async def shutdown(self):
+        """
+        Wait for background teardowns, then release app scoped generator
+        dependencies and the process pool.
+        """
+        await self.teardown.drain()
+        await self.app_scope.close()
+        self.process_pool.shutdown()
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator["Builder"]:
+        await self.startup()
+        try:
+            yield self
+        finally:
+            await self.shutdown()
+
+    def subscription(
         self,
         func: Optional[Callable] = None,
         *,
-        default_value: Optional[Any] = None,
         extra_args: Dict[str, gpt.Argument] = None,
         return_type: Union[None, Type[gpt.Scalar], Type[gpt.ObjectType]] = None,
         description: Optional[str] = None,
         deprecation_reason: Optional[str] = None,
+        buffer_size: Optional[int] = None,
+        overflow: Union[OverflowEnum, str] = OverflowEnum.BLOCK,
     ):
+        """
+        Field of a subscription type streaming what the async generator yields.
+        Its return annotation is ``AsyncIterator`` of the event type. Without
+        ``buffer_size`` events are produced only as fast as they are sent,
+        with it they are produced ahead up to the size and ``overflow`` policy.
+        """
+
         def inner(func: Callable):
-            sig = signature(func)
+            tree = build_dependency_tree(
+                func, annot_compiler=self.annot_compiler, artifact=self.artifact
+            )
+            subscribe = compile_subscription(
+                func,
+                tree.dependency,
+                tracer=self.tracer,
+                app_scope=self.app_scope,
+                buffer_size=buffer_size,
+                overflow=overflow,
+            )
+            for dependency in tree.flated_dependencies:
+                if dependency.scope is ScopeEnum.APP:
+                    self.app_scope.register(dependency)
+            args = SetDict(tree.flated_arguments)
+            args.update(extra_args or {})
 
-            nonlocal default_value
-            nonlocal extra_args
+            type_ = return_type
+            if not type_:
+                annotation = signature(func).return_annotation
+                if get_origin(annotation) in STREAM_ORIGINS:
+                    annotation = get_args(annotation)[0]
+                type_ = self.annot_compiler.compile(annotation, ContextEnum.FIELD)
 
-            compiled_func, args = self._compile_func(func, extra_args=extra_args)
+            return SubscriptionField(
+                type_,
+                subscribe=subscribe,
+                args=args,
+                description=description,
+                deprecation_reason=deprecation_reason,
+            )
+
+        if func:
+            return inner(func)
+        else:
+            return inner
 
-            # Set graphene Field type(=return_type).
-            nonlocal return_type
-            if not return_type:
-                return_type = self.annot_compiler.compile(
-                    sig.return_annotation, ContextEnum.FIELD
+    def field(
+        self,
+        func: Optional[Callable] = None,
+        *,
+        default_value: Optional[Any] = None,
+        extra_args: Dict[str, gpt.Argument] = None,
+        return_type: Union[None, Type[gpt.Scalar], Type[gpt.ObjectType]] = None,
+        description: Optional[str] = None,
+        deprecation_reason: Optional[str] = None,
+        cache: Optional[FieldCache] = None,
+        cost: Union[None, CostValue, FieldCost] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
+    ):
+        def inner(func: Callable):
+            if self.lazy:
+                field = LazyField(
+                    partial(
+                        self._compile_field,
+                        func,
+                        extra_args,
+                        return_type,
+                        cache,
+                        cost,
+                        max_concurrency,
+                        timeout,
+                        execution,
+                    ),
+                    default_value=default_value,
+                    description=description,
+                    deprecation_reason=deprecation_reason,
                 )
+                self._pending_fields.append(field)
+                return field
 
-            return gpt.Field(
+            compiled_func, args, type_ = self._compile_field(
+                func,
+                extra_args,
                 return_type,
+                cache,
+                cost,
+                max_concurrency,
+                timeout,
+                execution,
+            )
+            return gpt.Field(
+                type_,
                 args=args,
                 resolver=compiled_func,
                 default_value=default_value,
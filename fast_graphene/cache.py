@@ -0,0 +1,251 @@
+from abc import ABC, abstractmethod
+from asyncio import Task
+from collections import OrderedDict
+from collections.abc import Mapping
+from hashlib import sha1
+from json import dumps
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+
+class Missing:
+    pass
+
+
+MISSING = Missing()
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable form of value, to be used as a part of cache key."""
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    else:
+        return value
+
+
+class LRUCache:
+    """In-process cache evicting least recently used entries and expired ones."""
+
+    def __init__(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key: Hashable) -> Any:
+        try:
+            value, expires_at = self.data[key]
+        except KeyError:
+            return MISSING
+
+        if expires_at is not None and expires_at <= monotonic():
+            del self.data[key]
+            return MISSING
+        self.data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.data[key] = (value, None if ttl is None else monotonic() + ttl)
+        self.data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+
+class CachePolicy:
+    """
+    Memoizes a call scoped dependency across resolver calls, e.g.
+    ``DependOn(get_flags, cache=CachePolicy(maxsize=64, ttl=30))``.
+
+    Cache key is made of values of ``args``, which are field arguments and
+    default to arguments the dependency uses, of ``parent_attrs`` and of every
+    sub dependency, e.g. current user. Sub dependencies therefore run before
+    the cache is looked up, and their values should compare by value.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        *,
+        args: Optional[Iterable[str]] = None,
+        parent_attrs: Iterable[str] = (),
+    ):
+        self.args = None if args is None else tuple(args)
+        self.parent_attrs = tuple(parent_attrs)
+        self.cache = LRUCache(maxsize, ttl)
+        self.pending: Dict[Hashable, Task] = {}
+
+    def make_key(
+        self,
+        func: Any,
+        arg_names: Iterable[str],
+        parent: Any,
+        kwargs: Dict[str, Any],
+        dependencies: Dict[str, Any],
+    ) -> Hashable:
+        arg_names = arg_names if self.args is None else self.args
+        if isinstance(parent, Mapping):
+            parent_values = (parent.get(attr) for attr in self.parent_attrs)
+        else:
+            parent_values = (getattr(parent, attr, None) for attr in self.parent_attrs)
+        return (
+            func,
+            tuple(freeze(kwargs.get(name)) for name in arg_names),
+            tuple(map(freeze, parent_values)),
+            tuple((name, freeze(value)) for name, value in dependencies.items()),
+        )
+
+    def clear(self):
+        self.cache.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Storage of ``FieldCache``. Implement it to use an external key-value store;
+    keys are strings and values are whatever resolvers return.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Return cached value, or ``MISSING``."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    async def clear(self):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    def __init__(self, maxsize: Optional[int] = 1024, ttl: Optional[float] = None):
+        self.cache = LRUCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Any:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.cache.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        self.cache.delete(key)
+
+    async def clear(self):
+        self.cache.clear()
+
+
+def default_parent_key(parent: Any) -> Any:
+    """Parent identity from its ``id``, or ``MISSING`` not to cache at all."""
+    if parent is None or isinstance(parent, (str, int, float, bool)):
+        return parent
+    elif isinstance(parent, Mapping):
+        return parent.get("id", MISSING)
+    else:
+        return getattr(parent, "id", MISSING)
+
+
+class FieldCache:
+    """
+    Caches results of one field, e.g. ``Builder.field(cache=FieldCache(ttl=60))``.
+
+    Key is made of field arguments, values of dependencies named in
+    ``dependencies`` and ``parent_key(parent)``. Without dependencies in the
+    key, cache is checked before any dependency runs.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        maxsize: Optional[int] = 1024,
+        *,
+        backend: Optional[CacheBackend] = None,
+        dependencies: Iterable[str] = (),
+        parent_key: Callable[[Any], Any] = default_parent_key,
+    ):
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryBackend(maxsize)
+        self.dependencies = tuple(dependencies)
+        self.parent_key = parent_key
+        self.name: Optional[str] = None
+
+    def bind(self, func: Callable):
+        name = f"{func.__module__}.{func.__qualname__}"
+        if self.name is not None and self.name != name:
+            raise ValueError(f'FieldCache is already used by "{self.name}".')
+        self.name = name
+
+    def make_key(
+        self,
+        parent: Any,
+        args: Dict[str, Any],
+        dependencies: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        parent_key = self.parent_key(parent)
+        if parent_key is MISSING:
+            return None
+
+        dependencies = dependencies or {}
+        payload = dumps(
+            [
+                parent_key,
+                # Omitted nullable arguments and explicit nulls are the same.
+                sorted(
+                    (name, value) for name, value in args.items() if value is not None
+                ),
+                [dependencies.get(name) for name in self.dependencies],
+            ],
+            default=repr,
+        )
+        return f"fast_graphene:{self.name}:{sha1(payload.encode()).hexdigest()}"
+
+    async def get(
+        self, key: Optional[str], resolve: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if key is None:
+            return await resolve()
+
+        result = await self.backend.get(key)
+        if result is MISSING:
+            result = await resolve()
+            await self.backend.set(key, result, self.ttl)
+        return result
+
+    async def invalidate(
+        self,
+        parent: Any = None,
+        dependencies: Optional[Dict[str, Any]] = None,
+        **args: Any,
+    ):
+        """Drop the entry cached for given parent, arguments and dependencies."""
+        key = self.make_key(parent, args, dependencies)
+        if key is not None:
+            await self.backend.delete(key)
+
+    async def clear(self):
+        await self.backend.clear()
@@ -0,0 +1,161 @@
+"""
+Functions generated from source once at build time, so that what is known
+then, such as names of arguments and indices of dependency results, is
+written out instead of looked up on every call.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .dependencies import (
+    AppScope,
+    ChannelPool,
+    Dependency,
+    DependencyChannel,
+    get_request_scope,
+)
+from .profiling import Profiler
+from .teardown import TeardownPolicy
+from .tracing import Tracer
+
+
+def define(
+    name: str, source: str, namespace: Dict[str, Any], filename: str
+) -> Callable:
+    """Run ``source`` in ``namespace`` and return function ``name`` it defines."""
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace[name]
+
+
+def call_source(
+    target: str, arg_names: Iterable[str], dependency_indices: Dict[str, int]
+) -> str:
+    """Call of ``target`` with arguments and dependency results bound by name."""
+    # GraphQL omits nullable arguments without default value.
+    params = ["parent", "info"]
+    params.extend(f"{name}=kwargs.get({name!r})" for name in arg_names)
+    params.extend(
+        f"{name}=results[{index}]" for name, index in dependency_indices.items()
+    )
+    return f"{target}({', '.join(params)})"
+
+
+def make_execute(
+    executor: Callable,
+    dependency: Dependency,
+    tracer: Optional[Tracer] = None,
+    teardown: Optional[TeardownPolicy] = None,
+    app_scope: Optional[AppScope] = None,
+    channel_pool: Optional[ChannelPool] = None,
+) -> Callable:
+    """
+    Function resolving dependencies of ``dependency`` and then calling
+    ``executor``, returning an awaitable. Without dependencies it is a plain
+    call of ``executor`` with arguments picked by name, and no channel is made.
+    """
+    teardown = teardown or TeardownPolicy()
+    arg_names = tuple(dependency.arguments.keys())
+    dependency_indices = {
+        name: sub_dependency.index
+        for name, sub_dependency in dependency.dependencies_map.items()
+    }
+    call = call_source("executor", arg_names, dependency_indices)
+    filename = f"<execute of {getattr(dependency.func, '__qualname__', 'resolver')}>"
+    namespace: Dict[str, Any] = {"executor": executor}
+
+    if not dependency_indices:
+        source = f"def execute(parent, info, **kwargs):\n    return {call}\n"
+        return define("execute", source, namespace, filename)
+
+    if channel_pool is None:
+        acquire = (
+            "DependencyChannel(size, parent, info=info, scope=get_request_scope(info),"
+            " app_scope=app_scope, tracer=tracer, **kwargs)"
+        )
+        release = ""
+    else:
+        acquire = (
+            "channel_pool.acquire(size, parent, info, get_request_scope(info),"
+            " app_scope, None, tracer, kwargs)"
+        )
+        # Only on success, as nothing else may refer to channel then.
+        release = "    channel_pool.release(channel)\n"
+
+    source = (
+        "async def execute(parent, info, **kwargs):\n"
+        f"    channel = {acquire}\n"
+        "    try:\n"
+        "        await plan.run(channel)\n"
+        "        results = channel.results\n"
+        f"        result = await {call}\n"
+        "    finally:\n"
+        "        if channel.generator_stack:\n"
+        "            await teardown.release(channel)\n"
+        f"{release}"
+        "    return result\n"
+    )
+    namespace.update(
+        DependencyChannel=DependencyChannel,
+        get_request_scope=get_request_scope,
+        size=dependency.tree_size,
+        plan=dependency.plan,
+        app_scope=app_scope,
+        tracer=tracer,
+        teardown=teardown,
+        channel_pool=channel_pool,
+    )
+    return define("execute", source, namespace, filename)
+
+
+def make_sync_execute(
+    target: Callable,
+    dependency: Dependency,
+    profiler: Optional[Profiler] = None,
+    tracer: Optional[Tracer] = None,
+) -> Callable:
+    """
+    Like ``make_execute``, but for sync ``target`` and dependencies, returning
+    the result itself. Generator dependencies are released before it returns.
+    """
+    arg_names = tuple(dependency.arguments.keys())
+    dependency_indices = {
+        name: sub_dependency.index
+        for name, sub_dependency in dependency.dependencies_map.items()
+    }
+    call = call_source("target", arg_names, dependency_indices)
+    filename = f"<execute of {getattr(dependency.func, '__qualname__', 'resolver')}>"
+    namespace: Dict[str, Any] = {"target": target}
+
+    if not dependency_indices and profiler is None:
+        source = f"def execute(parent, info, **kwargs):\n    return {call}\n"
+        return define("execute", source, namespace, filename)
+
+    record = ""
+    if profiler is not None:
+        args = ", ".join(f"{name!r}: kwargs.get({name!r})" for name in arg_names)
+        record = (
+            "        if profile is not None:\n"
+            f"            profile.record(func, 'resolver', parent, {{{args}}})\n"
+        )
+    source = (
+        "def execute(parent, info, **kwargs):\n"
+        f"    profile = {'profiler.current()' if profiler is not None else 'None'}\n"
+        "    channel = DependencyChannel(size, parent, info=info, profile=profile,"
+        " tracer=tracer, **kwargs)\n"
+        "    try:\n"
+        "        plan.run_sync(channel)\n"
+        f"{record}"
+        "        results = channel.results\n"
+        f"        return {call}\n"
+        "    finally:\n"
+        "        if channel.generator_stack:\n"
+        "            channel.release_sync()\n"
+    )
+    namespace.update(
+        DependencyChannel=DependencyChannel,
+        func=dependency.func,
+        size=dependency.tree_size,
+        plan=dependency.plan,
+        profiler=profiler,
+        tracer=tracer,
+    )
+    return define("execute", source, namespace, filename)
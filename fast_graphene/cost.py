@@ -0,0 +1,195 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
+
+from graphene import types as gpt
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    get_named_type,
+    get_nullable_type,
+    GraphQLError,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    is_list_type,
+    OperationDefinitionNode,
+    parse,
+    SelectionSetNode,
+)
+from graphql.execution.values import get_argument_values
+
+CostValue = Union[float, Callable[[Dict[str, Any]], float]]
+
+
+class FieldCost:
+    """
+    Cost hint of a field, given as ``Builder.field(cost=...)``.
+
+    ``cost`` is a number or a function of field arguments. Cost of the
+    sub selection is multiplied by the first argument in ``multipliers``
+    given to the field, like ``first`` or ``limit`` of a list field.
+    Both are clamped at zero, so that e.g. ``first: -1000`` given by a
+    client cannot lower cost of the rest of the document.
+    """
+
+    def __init__(
+        self,
+        cost: CostValue = 1,
+        multipliers: Iterable[str] = ("first", "last", "limit"),
+    ):
+        self.cost = cost
+        self.multipliers = tuple(multipliers)
+
+    def own(self, args: Dict[str, Any]) -> float:
+        return max(0, self.cost(args) if callable(self.cost) else self.cost)
+
+    def multiplier(self, args: Dict[str, Any]) -> Optional[int]:
+        for name in self.multipliers:
+            if args.get(name) is not None:
+                return max(0, args[name])
+        return None
+
+
+def get_field_cost(field: GraphQLField) -> Optional[FieldCost]:
+    return getattr(field.resolve, "field_cost", None)
+
+
+class QueryCostError(GraphQLError):
+    def __init__(self, cost: float, budget: float):
+        super().__init__(f"Query cost {cost} exceeds budget {budget}.")
+        self.cost = cost
+        self.budget = budget
+
+
+class QueryCostAnalyzer:
+    """
+    Computes cost of a document from field cost hints before execution.
+    Fields without a hint cost ``default_cost``, and list fields without a
+    multiplier argument are expected to hold ``default_list_size`` items.
+    """
+
+    def __init__(
+        self,
+        schema: Union[gpt.Schema, GraphQLSchema],
+        budget: Optional[float] = None,
+        *,
+        default_cost: float = 1,
+        default_list_size: int = 10,
+    ):
+        self.schema: GraphQLSchema = getattr(schema, "graphql_schema", schema)
+        self.budget = budget
+        self.default_cost = default_cost
+        self.default_list_size = default_list_size
+
+    def cost(
+        self,
+        document: Union[str, DocumentNode],
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+    ) -> float:
+        if isinstance(document, str):
+            document = parse(document)
+
+        fragments: Dict[str, FragmentDefinitionNode] = {}
+        operations = []
+        for definition in document.definitions:
+            if isinstance(definition, FragmentDefinitionNode):
+                fragments[definition.name.value] = definition
+            elif isinstance(definition, OperationDefinitionNode):
+                if operation_name is None or (
+                    definition.name and definition.name.value == operation_name
+                ):
+                    operations.append(definition)
+
+        total = 0.0
+        for operation in operations:
+            root_type = self.schema.get_root_type(operation.operation)
+            if root_type is not None:
+                total += self._selection_set_cost(
+                    root_type, operation.selection_set, fragments, variables, set()
+                )
+        return total
+
+    def check(
+        self,
+        document: Union[str, DocumentNode],
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+    ) -> float:
+        """Return cost of document, raising ``QueryCostError`` above budget."""
+        cost = self.cost(document, variables, operation_name)
+        if self.budget is not None and cost > self.budget:
+            raise QueryCostError(cost, self.budget)
+        return cost
+
+    def _selection_set_cost(
+        self,
+        parent_type: GraphQLNamedType,
+        selection_set: SelectionSetNode,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Optional[Dict[str, Any]],
+        visited: Set[str],
+    ) -> float:
+        total = 0.0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                total += self._field_cost(
+                    parent_type, selection, fragments, variables, visited
+                )
+                continue
+
+            if isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in visited or name not in fragments:
+                    continue
+                fragment = fragments[name]
+                visited = visited | {name}
+            elif isinstance(selection, InlineFragmentNode):
+                fragment = selection
+            else:
+                continue
+
+            fragment_type = parent_type
+            if fragment.type_condition is not None:
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+            total += self._selection_set_cost(
+                fragment_type, fragment.selection_set, fragments, variables, visited
+            )
+        return total
+
+    def _field_cost(
+        self,
+        parent_type: GraphQLNamedType,
+        node: FieldNode,
+        fragments: Dict[str, FragmentDefinitionNode],
+        variables: Optional[Dict[str, Any]],
+        visited: Set[str],
+    ) -> float:
+        if not isinstance(parent_type, (GraphQLObjectType, GraphQLInterfaceType)):
+            return 0.0
+        field = parent_type.fields.get(node.name.value)
+        if field is None:  # Introspection fields and invalid ones.
+            return 0.0
+
+        args = get_argument_values(field, node, variables)
+        field_cost = get_field_cost(field)
+        own = field_cost.own(args) if field_cost else self.default_cost
+        multiplier = field_cost.multiplier(args) if field_cost else None
+        if multiplier is None:
+            is_list = is_list_type(get_nullable_type(field.type))
+            multiplier = self.default_list_size if is_list else 1
+
+        children = 0.0
+        if node.selection_set is not None:
+            children = self._selection_set_cost(
+                get_named_type(field.type),
+                node.selection_set,
+                fragments,
+                variables,
+                visited,
+            )
+        return own + multiplier * children
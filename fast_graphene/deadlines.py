@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Iterator, Optional
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar(
+    "fast_graphene_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Time budget of an operation executed within, shared by every field and
+    dependency of it. Nested deadlines can only shorten the budget.
+    """
+    at = monotonic() + seconds
+    current = _current_deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _current_deadline.set(at)
+    try:
+        yield at
+    finally:
+        _current_deadline.reset(token)
+
+
+def time_left(timeout: Optional[float] = None) -> Optional[float]:
+    """Seconds left for a field with ``timeout``, or ``None`` if unbounded."""
+    at = _current_deadline.get()
+    if at is None:
+        return timeout
+    left = at - monotonic()
+    return left if timeout is None else min(left, timeout)
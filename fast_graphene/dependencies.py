@@ -1,52 +1,104 @@
-from asyncio import create_task, Event, gather, LifoQueue
-from copy import copy
+from abc import ABC, abstractmethod
+from asyncio import create_task, FIRST_COMPLETED, gather, shield, Task, wait
+from collections import deque
+from collections.abc import Mapping
 from inspect import (
+    isasyncgen,
     isasyncgenfunction,
     iscoroutinefunction,
     isfunction,
     isgeneratorfunction,
 )
-from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from graphene import types as gpt
 
 from .annot_compiler import AnnotCompiler
-from .param_collector import interpret_params
+from .artifact import SchemaArtifact
+from .batch import BatchLoader
+from .cache import CachePolicy, freeze, MISSING
+from .executors import check_process_func, ProcessPool
+from .limits import ConcurrencyLimit
+from .param_collector import (
+    BatchDependOn,
+    DependOn,
+    interpret_params,
+    pick_used_params_only,
+)
+from .profiling import OperationProfile
+from .tracing import Tracer
+from .types import ExecutionEnum, ScopeEnum
 from .utils import SetDict
 
-
-class Empty:
-    pass
+REQUEST_SCOPE_KEY = "request_scope"
 
 
 # Will be used later.
 class Dependency:
+    __slots__ = (
+        "func",
+        "is_async_func",
+        "is_async_gen",
+        "is_generator",
+        "is_sync_func",
+        "dependencies_map",
+        "dependencies",
+        "arguments",
+        "tree_arguments",
+        "return_type",
+        "scope",
+        "cache_policy",
+        "is_shared",
+        "max_concurrency",
+        "execution",
+        "limit",
+        "process_pool",
+        "is_inline",
+        "index",
+        "tree_size",
+        "_plan",
+    )
+    kind = "dependency"
+
     def __init__(
         self,
         func: Callable,
         dependencies_map: Optional[Dict[str, "Dependency"]] = None,
         arguments: Optional[Dict[str, gpt.Argument]] = None,
         return_type: Optional[Any] = None,
+        scope: Union[ScopeEnum, str] = ScopeEnum.CALL,
+        cache_policy: Optional[CachePolicy] = None,
+        max_concurrency: Optional[int] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
     ):
         self.func: Callable = func
         # TODO: Let to collect params, dependencies and arguments at once.
         self.func = func
         self.is_async_func = iscoroutinefunction(func)
         self.is_async_gen = isasyncgenfunction(func)
-        # TODO: Support for async generator
-        # Async generator dependency makes deadlock.
-        # When it makes deadlock, its type is coroutine.
-        # Figure out why, async generator's type is coroutine on runtime
-        if self.is_async_gen:
-            raise NotImplementedError(
-                "Async generator dependency is not supported currently."
-            )
-        self.is_sync_func = isfunction(func)
         self.is_generator = isgeneratorfunction(func)
+        self.is_sync_func = isfunction(func) and not any(
+            (self.is_async_func, self.is_async_gen, self.is_generator)
+        )
         if not any(
             (
                 self.is_async_func,
-                self.is_async_func,
+                self.is_async_gen,
                 self.is_sync_func,
                 self.is_generator,
             )
@@ -55,7 +107,46 @@ class Dependency:
         self.dependencies_map = dependencies_map or {}
         self.dependencies = list(self.dependencies_map.values())
         self.arguments = arguments or {}
+        # Field arguments used anywhere in the tree, keying shared results.
+        self.tree_arguments: Tuple[str, ...] = tuple(
+            dict.fromkeys(
+                [
+                    *self.arguments,
+                    *(
+                        name
+                        for sub_dependency in self.dependencies
+                        for name in sub_dependency.tree_arguments
+                    ),
+                ]
+            )
+        )
         self.return_type = return_type
+        self.scope = ScopeEnum(scope)
+        self.cache_policy = cache_policy
+        if cache_policy is not None and (self.is_generator or self.is_async_gen):
+            raise ValueError(f'Generator dependency "{func}" cannot be cached.')
+        # Results shared beyond one call are computed with their own plan.
+        # Cached ones are not, as their sub dependencies are part of the key.
+        self.is_shared = self.scope is not ScopeEnum.CALL
+        self.max_concurrency = max_concurrency
+        self.execution = ExecutionEnum(execution)
+        if self.execution is ExecutionEnum.PROCESS:
+            check_process_func(func)
+        # Shared by every tree using the function, set by Builder.
+        self.limit: Optional[ConcurrencyLimit] = None
+        self.process_pool: Optional[ProcessPool] = None
+        # Sync dependencies without their own cache, limit or process run inline.
+        self.is_inline = (
+            not self.is_shared
+            and cache_policy is None
+            and max_concurrency is None
+            and self.execution is ExecutionEnum.DEFAULT
+            and not (self.is_async_func or self.is_async_gen)
+        )
+        # Position of result in channel, and count of them, set for the tree.
+        self.index = 0
+        self.tree_size = 1
+        self._plan: Optional[ExecutionPlan] = None
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Dependency):
@@ -68,6 +159,12 @@ class Dependency:
     def __repr__(self):
         return f"<Dependency uses {self.func}>"
 
+    @property
+    def plan(self) -> "ExecutionPlan":
+        if self._plan is None:
+            self._plan = ExecutionPlan(self.dependencies)
+        return self._plan
+
     def __call__(
         self,
         parent: Any,
@@ -84,74 +181,613 @@ class Dependency:
         args: Dict[str, Any],
         channel: "DependencyChannel",
     ):
-        if self.dependencies:
-            dep_results = await gather(
-                *[channel.get(dep) for dep in self.dependencies], return_exceptions=True
+        await self.plan.run(channel)
+        return await self.resolve(parent, info, args, channel)
+
+    async def resolve(
+        self,
+        parent: Any,
+        info: gpt.ResolveInfo,
+        args: Dict[str, Any],
+        channel: "DependencyChannel",
+    ):
+        """Call function with sub dependencies already resolved in channel."""
+        if self.execution is ExecutionEnum.PROCESS:
+            if self.process_pool is None:
+                raise RuntimeError(f'No process pool to run "{self.func}" in.')
+            return await self.process_pool.run(
+                self.func, {**args, **channel.values_of(self)}
             )
-        else:
-            dep_results = []
 
-        result = self.func(
-            parent, info, **args, **dict(zip(self.dependencies_map.keys(), dep_results))
-        )
-        if self.is_async_func or self.is_async_gen:
+        result = self.func(parent, info, **args, **channel.values_of(self))
+        if self.is_async_func:
             return await result
         else:
             return result
 
 
+class BatchDependency(Dependency):
+    __slots__ = ("key_dependency", "loader")
+    kind = "batch"
+
+    def __init__(
+        self,
+        func: Callable,
+        key_dependency: Dependency,
+        max_concurrency: Optional[int] = None,
+    ):
+        super().__init__(
+            func,
+            dependencies_map={"key": key_dependency},
+            max_concurrency=max_concurrency,
+        )
+        if self.is_generator:
+            raise TypeError(f'Batch dependency "{func}" cannot be a generator.')
+        self.is_inline = False
+        self.key_dependency = key_dependency
+        self.loader = BatchLoader(func)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BatchDependency):
+            return NotImplemented
+        return self.func is other.func and self.key_dependency == other.key_dependency
+
+    def __hash__(self):
+        return hash((self.func, self.key_dependency))
+
+    def __repr__(self):
+        return f"<BatchDependency uses {self.func} by {self.key_dependency.func}>"
+
+    async def resolve(
+        self,
+        parent: Any,
+        info: gpt.ResolveInfo,
+        args: Dict[str, Any],
+        channel: "DependencyChannel",
+    ):
+        key = channel.results[self.key_dependency.index]
+        if channel.scope is not None:
+            loader = channel.scope.get_loader(self)
+        else:
+            loader = self.loader
+        return await loader.load(key)
+
+
+class ExecutionPlan:
+    """
+    Dependencies sorted once at build time, so that every dependency comes
+    after its sub dependencies. Each one starts as soon as its own sub
+    dependencies are done: sync ones run inline and async ones are awaited,
+    as tasks if several run at once, so that independent chains do not wait
+    for each other. When one of them fails, the others are cancelled.
+    Sub dependencies of request scoped and app scoped dependencies are left to
+    their own plan, which runs only when there is no shared result yet.
+    """
+
+    __slots__ = ("dependencies", "sub_dependencies", "dependents", "is_inline")
+
+    def __init__(self, dependencies: Iterable[Dependency]):
+        # Sub dependencies in plan, in order of visit, so children come first.
+        sub_dependencies: Dict[Dependency, Tuple[Dependency, ...]] = {}
+
+        def visit(dependency: Dependency):
+            if dependency not in sub_dependencies:
+                children = () if dependency.is_shared else dependency.dependencies
+                for child in children:
+                    visit(child)
+                sub_dependencies[dependency] = tuple(dict.fromkeys(children))
+
+        for dependency in dependencies:
+            visit(dependency)
+
+        dependents: Dict[Dependency, List[Dependency]] = {
+            dependency: [] for dependency in sub_dependencies
+        }
+        for dependency, children in sub_dependencies.items():
+            for child in children:
+                dependents[child].append(dependency)
+
+        self.dependencies: Tuple[Dependency, ...] = tuple(sub_dependencies)
+        self.sub_dependencies = sub_dependencies
+        self.dependents: Dict[Dependency, Tuple[Dependency, ...]] = {
+            dependency: tuple(parents) for dependency, parents in dependents.items()
+        }
+        self.is_inline = all(dependency.is_inline for dependency in self.dependencies)
+
+    def check_sync(self):
+        """Make sure every dependency can run in ``run_sync``."""
+        for dependency in self.dependencies:
+            if not dependency.is_inline:
+                raise TypeError(
+                    f'Dependency "{dependency.func}" cannot run in sync mode. '
+                    "Only sync, call scoped dependencies without cache, "
+                    "max_concurrency or process execution can."
+                )
+
+    def run_sync(self, channel: "DependencyChannel"):
+        """Run a plan of inline dependencies only, without an event loop."""
+        results = channel.results
+        for dependency in self.dependencies:
+            if results[dependency.index] is MISSING:
+                channel.run_inline(dependency)
+
+    async def run(self, channel: "DependencyChannel"):
+        if self.is_inline:
+            return self.run_sync(channel)
+
+        results = channel.results
+        # Count of sub dependencies left to finish, for those waiting on any.
+        waiting: Dict[Dependency, int] = {}
+        ready: Deque[Dependency] = deque()
+        for dependency in self.dependencies:
+            if results[dependency.index] is MISSING:
+                count = sum(
+                    results[child.index] is MISSING
+                    for child in self.sub_dependencies[dependency]
+                )
+                if count:
+                    waiting[dependency] = count
+                else:
+                    ready.append(dependency)
+
+        def finish(dependency: Dependency):
+            for parent in self.dependents[dependency]:
+                if parent in waiting:
+                    waiting[parent] -= 1
+                    if not waiting[parent]:
+                        del waiting[parent]
+                        ready.append(parent)
+
+        tasks: Dict[Task, Dependency] = {}
+        try:
+            while ready or tasks:
+                starting = []
+                while ready:
+                    dependency = ready.popleft()
+                    if dependency.is_inline:
+                        channel.run_inline(dependency)
+                        finish(dependency)
+                    else:
+                        starting.append(dependency)
+
+                if len(starting) == 1 and not tasks:
+                    # Nothing else can start meanwhile, so no task is needed.
+                    await channel.run(starting[0])
+                    finish(starting[0])
+                    continue
+                for dependency in starting:
+                    tasks[create_task(channel.run(dependency))] = dependency
+                if not tasks:
+                    continue
+
+                done, _ = await wait(tasks, return_when=FIRST_COMPLETED)
+                for task in done:
+                    dependency = tasks.pop(task)
+                    task.result()
+                    finish(dependency)
+        finally:
+            if tasks:
+                for task in tasks:
+                    task.cancel()
+                await wait(tasks)
+                for task in tasks:
+                    if not task.cancelled():
+                        task.exception()  # Retrieved, not to be logged.
+
+
 class DependencyChannel:
+    """
+    State of one resolver call. Results are kept in a list indexed by
+    ``Dependency.index``, sized from the dependency tree, ``MISSING`` until set.
+    """
+
+    __slots__ = (
+        "results",
+        "generator_stack",
+        "parent",
+        "info",
+        "scope",
+        "app_scope",
+        "profile",
+        "tracer",
+        "kwargs",
+    )
+
     def __init__(
         self,
-        dependencies: Iterable[Dependency],
+        size: int = 1,
         parent: Optional[Any] = None,
         *,
         info: gpt.ResolveInfo,
+        scope: Optional["RequestScope"] = None,
+        app_scope: Optional["AppScope"] = None,
+        profile: Optional[OperationProfile] = None,
+        tracer: Optional[Tracer] = None,
         **kwargs,
     ):
-        self.dependencies = dependencies
-        self.results = {dependency: Empty for dependency in dependencies}
-        self.events = {dependency: Event() for dependency in dependencies}
-        self.generator_stack: LifoQueue = LifoQueue()
+        self.results: List[Any] = [MISSING] * size
+        self.generator_stack: List[Union[Generator, AsyncGenerator]] = []
         self.parent = parent
         self.info = info
+        self.scope = scope
+        self.app_scope = app_scope
+        self.profile = profile
+        self.tracer = tracer
         self.kwargs = kwargs
 
-    async def _execute(self, dependency: Dependency):
-        if dependency.is_async_func:
-            data = await dependency(self.parent, self.info, self.kwargs, self)
+    def arguments_of(self, dependency: Dependency) -> Dict[str, Any]:
+        return pick_used_params_only(dependency.arguments.keys(), self.kwargs)
+
+    def values_of(self, dependency: Dependency) -> Dict[str, Any]:
+        results = self.results
+        return {
+            name: results[sub_dependency.index]
+            for name, sub_dependency in dependency.dependencies_map.items()
+        }
+
+    def run_inline(self, dependency: Dependency):
+        if self.tracer is None:
+            return self._run_inline(dependency)
+        with self.tracer.span("dependency", dependency.func, self.info, self.parent):
+            return self._run_inline(dependency)
+
+    def _run_inline(self, dependency: Dependency):
+        args = self.arguments_of(dependency)
+        result = dependency.func(
+            self.parent, self.info, **args, **self.values_of(dependency)
+        )
+        if dependency.is_generator:
+            self.generator_stack.append(result)
+            result = next(result)
+        if self.profile is not None:
+            self.profile.record(
+                dependency.func, dependency.kind, self.parent, args, result
+            )
+        self.results[dependency.index] = result
+
+    async def call(self, dependency: Dependency, with_plan: bool = False):
+        """Run dependency and keep its generator to release later."""
+        if self.tracer is None:
+            return await self._call(dependency, with_plan)
+        with self.tracer.span("dependency", dependency.func, self.info, self.parent):
+            return await self._call(dependency, with_plan)
+
+    async def _call(self, dependency: Dependency, with_plan: bool):
+        args = self.arguments_of(dependency)
+        if dependency.limit is not None:
+            async with dependency.limit:
+                result = await self._invoke(dependency, args, with_plan)
+        else:
+            result = await self._invoke(dependency, args, with_plan)
+        if dependency.is_generator:
+            self.generator_stack.append(result)
+            result = next(result)
         elif dependency.is_async_gen:
-            gen = dependency(self.parent, self.info, self.kwargs, self)
-            data = await gen.__anext__()
-            self.generator_stack.put(gen)
-        elif dependency.is_sync_func:
-            data = dependency(self.parent, self.info, self.kwargs, self)
-        elif dependency.is_generator:
-            gen = dependency(self.parent, self.info, self.kwargs, self)
-            data = next(gen)
-            self.generator_stack.put(gen)
-
-        self.results[dependency] = data
-        self.events[dependency].set()
+            self.generator_stack.append(result)
+            result = await result.__anext__()
+        if self.profile is not None:
+            self.profile.record(
+                dependency.func, dependency.kind, self.parent, args, result
+            )
+        return result
 
-    async def get(self, dependency: Dependency):
-        if not self.events[dependency].is_set():
-            task = create_task(self._execute(dependency))
-            await self.events[dependency].wait()
+    async def call_cached(self, dependency: Dependency):
+        """Call dependency, its sub dependencies already resolved, or get cached."""
+        policy = dependency.cache_policy
+        key = policy.make_key(
+            dependency.func,
+            dependency.arguments.keys(),
+            self.parent,
+            self.kwargs,
+            self.values_of(dependency),
+        )
+        result = policy.cache.get(key)
+        if result is not MISSING:
+            return result
+
+        # Concurrent misses of the same key wait for one call.
+        if key not in policy.pending:
+            task = create_task(self.call(dependency))
+            policy.pending[key] = task
+
+            def store(task: Task):
+                policy.pending.pop(key, None)
+                if not task.cancelled() and task.exception() is None:
+                    policy.cache.set(key, task.result())
+
+            task.add_done_callback(store)
+        return await shield(policy.pending[key])
+
+    def _invoke(self, dependency: Dependency, args: Dict[str, Any], with_plan: bool):
+        if with_plan:
+            return dependency(self.parent, self.info, args, self)
+        else:
+            return dependency.resolve(self.parent, self.info, args, self)
+
+    async def run(self, dependency: Dependency):
+        if dependency.cache_policy is not None and dependency.scope is ScopeEnum.CALL:
+            self.results[dependency.index] = await self.call_cached(dependency)
+        elif dependency.scope is ScopeEnum.CALL:
+            self.results[dependency.index] = await self.call(dependency)
+        elif dependency.scope is ScopeEnum.REQUEST and self.scope is not None:
+            self.results[dependency.index] = await self.scope.get(dependency, self)
+        elif dependency.scope is ScopeEnum.APP and self.app_scope is not None:
+            self.results[dependency.index] = await self.app_scope.get(dependency, self)
+        else:
+            self.results[dependency.index] = await self.call(dependency, with_plan=True)
 
-            await task
-            if exception := task.exception():
-                raise exception
+    async def get(self, dependency: Dependency):
+        if self.results[dependency.index] is MISSING:
+            if not dependency.is_shared:
+                await dependency.plan.run(self)
+            await self.run(dependency)
 
-        return self.results[dependency]
+        return self.results[dependency.index]
 
     async def release(self):
-        while not self.generator_stack.empty():
-            gen = await self.generator_stack.get()
-            if gen.is_async_gen:
-                await gen
+        await release_generators(self.generator_stack, self.tracer, self.info)
+
+    def release_sync(self):
+        """Release sync generators, as ``release`` does without an event loop."""
+        generator_stack = self.generator_stack
+        while generator_stack:
+            gen = generator_stack.pop()
+            if self.tracer is None:
+                next(gen, None)
             else:
-                next(gen)
+                with self.tracer.span("teardown", gen, self.info):
+                    next(gen, None)
+
+
+class ChannelPool:
+    """
+    Channels of finished resolver calls kept for reuse, so that list fields
+    with many rows allocate fewer short lived objects. Channels with
+    generators left to release are not taken back.
+    """
+
+    __slots__ = ("channels", "maxsize")
+
+    def __init__(self, maxsize: int = 256):
+        self.channels: List[DependencyChannel] = []
+        self.maxsize = maxsize
+
+    def acquire(
+        self,
+        size: int,
+        parent: Any,
+        info: gpt.ResolveInfo,
+        scope: Optional["RequestScope"],
+        app_scope: Optional["AppScope"],
+        profile: Optional[OperationProfile],
+        tracer: Optional[Tracer],
+        kwargs: Dict[str, Any],
+    ) -> DependencyChannel:
+        if not self.channels:
+            return DependencyChannel(
+                size,
+                parent,
+                info=info,
+                scope=scope,
+                app_scope=app_scope,
+                profile=profile,
+                tracer=tracer,
+                **kwargs,
+            )
+
+        channel = self.channels.pop()
+        channel.results = [MISSING] * size
+        channel.parent = parent
+        channel.info = info
+        channel.scope = scope
+        channel.app_scope = app_scope
+        channel.profile = profile
+        channel.tracer = tracer
+        channel.kwargs = kwargs
+        return channel
+
+    def release(self, channel: DependencyChannel):
+        if channel.generator_stack or len(self.channels) >= self.maxsize:
+            return
+        # Not to keep results and parent alive until reused.
+        channel.results = channel.parent = channel.info = channel.kwargs = None
+        channel.scope = channel.app_scope = channel.profile = None
+        self.channels.append(channel)
+
+
+class DependencyScope(ABC):
+    """
+    Computes each dependency once per values of field arguments its tree uses,
+    and releases generators when closed.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[Hashable, Task] = {}
+        self.generator_stack: List[Union[Generator, AsyncGenerator]] = []
+        self.tracer: Optional[Tracer] = None
+
+    @abstractmethod
+    async def _execute(
+        self, dependency: Dependency, channel: Optional[DependencyChannel]
+    ):
+        """Compute result of ``dependency``, shared by the scope."""
+
+    async def get(
+        self, dependency: Dependency, channel: Optional[DependencyChannel] = None
+    ):
+        key: Hashable = dependency
+        if dependency.tree_arguments and channel is not None:
+            kwargs = channel.kwargs
+            key = (
+                dependency,
+                tuple(freeze(kwargs.get(name)) for name in dependency.tree_arguments),
+            )
+        task = self.tasks.get(key)
+        if task is None:
+            task = self.tasks[key] = create_task(self._execute(dependency, channel))
+
+            def forget_failed(task: Task):
+                # Not kept, so that the next request tries again.
+                if task.cancelled() or task.exception() is not None:
+                    if self.tasks.get(key) is task:
+                        del self.tasks[key]
+
+            task.add_done_callback(forget_failed)
+        # Other fields may wait for it, so a cancelled field leaves it running.
+        return await shield(task)
+
+    async def close(self):
+        await release_generators(self.generator_stack, self.tracer)
+        self.tasks.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class RequestScope(DependencyScope):
+    """
+    Shares results of ``scope="request"`` dependencies across every field of
+    one operation. Pass it through ``context_value``, either as
+    ``{"request_scope": scope}`` or as ``request_scope`` attribute, and close it
+    when the operation finishes to release generator dependencies.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loaders: Dict[BatchDependency, BatchLoader] = {}
+
+    def get_loader(self, dependency: BatchDependency) -> BatchLoader:
+        """Batch loader caching loaded keys until the operation finishes."""
+        if dependency not in self.loaders:
+            self.loaders[dependency] = BatchLoader(dependency.func, cache=True)
+        return self.loaders[dependency]
+
+    async def _execute(self, dependency: Dependency, channel: DependencyChannel):
+        self.tracer = self.tracer or channel.tracer
+        # Own results, so that sub dependencies, and generators among them,
+        # belong to the scope rather than to the field asking first.
+        sub_channel = DependencyChannel(
+            dependency.tree_size,
+            parent=channel.parent,
+            info=channel.info,
+            scope=self,
+            app_scope=channel.app_scope,
+            profile=channel.profile,
+            tracer=channel.tracer,
+            **channel.kwargs,
+        )
+        sub_channel.generator_stack = self.generator_stack
+        return await sub_channel.call(dependency, with_plan=True)
+
+    def adopt(self, channel: DependencyChannel):
+        """Take over generators of channel to release them with the scope."""
+        self.tracer = self.tracer or channel.tracer
+        self.generator_stack.extend(channel.generator_stack)
+        channel.generator_stack.clear()
+
+    async def close(self):
+        await super().close()
+        self.loaders.clear()
+
+
+class AppScope(DependencyScope):
+    """
+    Holds ``scope="app"`` dependencies of a ``Builder`` for the lifetime of
+    the process. They get no parent and info, and may only depend on other
+    app scoped dependencies.
+    """
+
+    def __init__(self, tracer: Optional[Tracer] = None):
+        super().__init__()
+        self.tracer = tracer
+        self.dependencies: Set[Dependency] = set()
+
+    def register(self, dependency: Dependency):
+        self.dependencies.add(dependency)
+
+    async def _execute(
+        self, dependency: Dependency, channel: Optional[DependencyChannel]
+    ):
+        app_channel = DependencyChannel(
+            dependency.tree_size, info=None, app_scope=self, tracer=self.tracer
+        )
+        app_channel.generator_stack = self.generator_stack
+        return await app_channel.call(dependency, with_plan=True)
+
+    async def startup(self):
+        """Set up every registered dependency ahead of the first request."""
+        await gather(*[self.get(dependency) for dependency in self.dependencies])
+
+
+def get_request_scope(info: Optional[gpt.ResolveInfo]) -> Optional[RequestScope]:
+    context = getattr(info, "context", None)
+    if isinstance(context, Mapping):
+        return context.get(REQUEST_SCOPE_KEY)
+    else:
+        return getattr(context, REQUEST_SCOPE_KEY, None)
+
+
+async def release_generator(gen: Union[Generator, AsyncGenerator]):
+    if isasyncgen(gen):
+        try:
+            await gen.__anext__()
+        except StopAsyncIteration:
+            pass
+    else:
+        next(gen, None)
+
+
+async def release_generators(
+    generator_stack: List[Union[Generator, AsyncGenerator]],
+    tracer: Optional[Tracer] = None,
+    info: Optional[gpt.ResolveInfo] = None,
+):
+    while generator_stack:
+        gen = generator_stack.pop()
+        if tracer is None:
+            await release_generator(gen)
+        else:
+            with tracer.span("teardown", gen, info):
+                await release_generator(gen)
+
+
+def index_tree(root: Dependency):
+    """Number results of dependency tree, equal dependencies sharing a number."""
+    indices: Dict[Dependency, int] = {}
+    nodes: Dict[int, Dependency] = {}
+    stack = [root]
+    while stack:
+        dependency = stack.pop()
+        if id(dependency) in nodes:
+            continue
+        nodes[id(dependency)] = dependency
+        dependency.index = indices.setdefault(dependency, len(indices))
+        stack.extend(dependency.dependencies)
+
+    for dependency in nodes.values():
+        dependency.tree_size = len(indices)
+
+
+def merge_arguments(
+    arguments: SetDict, new_arguments: Dict[str, gpt.Argument], func: Callable
+):
+    """
+    Add field arguments of ``func`` to those of the tree. Functions may ask
+    for the same argument, e.g. ``id`` of both resolver and dependency, as
+    long as they agree on its type.
+    """
+    for name, argument in new_arguments.items():
+        existing = arguments.get(name)
+        if existing is None:
+            arguments[name] = argument
+        elif existing.type != argument.type:
+            raise TypeError(
+                f'Argument "{name}" of "{func}" is {argument.type}, '
+                f"but {existing.type} elsewhere in its dependency tree."
+            )
 
 
 class DependencyBuildResult(NamedTuple):
@@ -161,28 +797,94 @@ class DependencyBuildResult(NamedTuple):
 
 
 def build_dependency_tree(
-    root_depend: Callable, annot_compiler: Optional[AnnotCompiler] = None
+    root_depend: Callable,
+    annot_compiler: Optional[AnnotCompiler] = None,
+    artifact: Optional[SchemaArtifact] = None,
 ) -> DependencyBuildResult:
+    """
+    Build dependency graph of ``root_depend``. Each declared dependency is
+    built once and shared by every dependency using it, so that building
+    takes linear time even for diamond shaped graphs.
+    """
     annot_compiler = annot_compiler or AnnotCompiler()
     flated_dependencies = set()
-    flated_arguments = SetDict()  # TODO: Check if arugment used in duplicate.
+    flated_arguments = SetDict()
+    built: Dict[DependOn, Dependency] = {}
+    params: Dict[Callable, Tuple[Dict[str, gpt.Argument], Dict[str, DependOn]]] = {}
+    path: List[Callable] = []
+
+    def interpret(func: Callable):
+        if func in path:
+            cycle = path[path.index(func) :] + [func]
+            raise ValueError(
+                "Dependency cycle found: "
+                + " -> ".join(
+                    getattr(item, "__qualname__", repr(item)) for item in cycle
+                )
+            )
+        if func not in params:
+            if artifact is not None:
+                params[func] = artifact.interpret(func, annot_compiler=annot_compiler)
+            else:
+                params[func] = interpret_params(func, annot_compiler=annot_compiler)
+        return params[func]
+
+    def build(depend_on: DependOn) -> Dependency:
+        if depend_on not in built:
+            built[depend_on] = traverse(depend_on.func, depend_on)
+            flated_dependencies.add(built[depend_on])
+        return built[depend_on]
 
-    def traverse(func, accum_dependencies: set):
-        args, dep_funcs = interpret_params(func)
-        flated_arguments.update(args)
+    def traverse(func: Callable, depend_on: Optional[DependOn] = None) -> Dependency:
+        args, depend_ons = interpret(func)
+        merge_arguments(flated_arguments, args, func)
 
+        path.append(func)
         dependencies_map = {}
-        for name, dfn in dep_funcs.items():
-            added_set = copy(accum_dependencies)
-            added_set.add(dfn)
-            dependency = traverse(dfn, added_set)
+        for name, sub_depend_on in depend_ons.items():
+            if isinstance(sub_depend_on, BatchDependOn):
+                dependency = built.get(sub_depend_on)
+                if dependency is None:
+                    dependency = built[sub_depend_on] = BatchDependency(
+                        sub_depend_on.func,
+                        build(DependOn(sub_depend_on.key)),
+                        max_concurrency=sub_depend_on.max_concurrency,
+                    )
+                    flated_dependencies.add(dependency)
+            else:
+                dependency = build(sub_depend_on)
             dependencies_map[name] = dependency
-            flated_dependencies.add(dependency)
+        path.pop()
+
+        if depend_on is None:  # Root of the tree.
+            return Dependency(func, arguments=args, dependencies_map=dependencies_map)
 
-        return Dependency(func, arguments=args, dependencies_map=dependencies_map)
+        if depend_on.scope is ScopeEnum.APP:
+            if args:
+                raise ValueError(
+                    f'App scoped dependency "{func}" cannot use arguments {list(args)}.'
+                )
+            for dependency in dependencies_map.values():
+                if dependency.scope is not ScopeEnum.APP:
+                    raise ValueError(
+                        f'App scoped dependency "{func}" can only depend on app '
+                        f'scoped dependencies, not "{dependency.func}".'
+                    )
+
+        return Dependency(
+            func,
+            arguments=args,
+            dependencies_map=dependencies_map,
+            scope=depend_on.scope,
+            cache_policy=depend_on.cache,
+            max_concurrency=depend_on.max_concurrency,
+            execution=depend_on.execution,
+        )
 
+    root = traverse(root_depend)
+    index_tree(root)
     return DependencyBuildResult(
-        dependency=traverse(root_depend, set()),
+        dependency=root,
         flated_dependencies=flated_dependencies,
         flated_arguments=flated_arguments,
     )
@@ -0,0 +1,54 @@
+import concurrent.futures
+from asyncio import get_running_loop
+from functools import partial
+from inspect import (
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isfunction,
+    isgeneratorfunction,
+)
+from typing import Any, Callable, Dict, Optional
+
+
+def call_plain(func: Callable, kwargs: Dict[str, Any]) -> Any:
+    # No parent and info, as they cannot cross process boundary.
+    return func(None, None, **kwargs)
+
+
+def check_process_func(func: Callable):
+    if not isfunction(func) or any(
+        check(func)
+        for check in (iscoroutinefunction, isasyncgenfunction, isgeneratorfunction)
+    ):
+        raise TypeError(f'Only plain sync function can run in process, not "{func}".')
+
+
+class ProcessPool:
+    """
+    Process pool of a ``Builder`` for CPU bound functions given
+    ``execution="process"``. Functions must be importable by name, and get
+    ``None`` as parent and info with only field arguments and dependency
+    values, which must be picklable.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> "concurrent.futures.ProcessPoolExecutor":
+        # Created on first use, so that workers fork after the app is set up.
+        # Accessed through the package, which imports its module only then.
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def run(self, func: Callable, kwargs: Dict[str, Any]):
+        return get_running_loop().run_in_executor(
+            self.executor, partial(call_plain, func, kwargs)
+        )
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,65 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from graphene import types as gpt
+from graphene.types.argument import to_arguments
+
+from .types import GrapheneType
+
+FieldCompileResult = Tuple[Callable, Dict[str, gpt.Argument], GrapheneType]
+
+
+class LazyField(gpt.Field):
+    """
+    Field which compiles its resolver, arguments and type on first access,
+    which is usually schema construction. Fields of types never reached by
+    any schema are never compiled.
+    """
+
+    def __init__(self, compile_field: Callable[[], FieldCompileResult], **kwargs):
+        self._compile_field: Optional[Callable[[], FieldCompileResult]] = compile_field
+        super().__init__(None, **kwargs)
+
+    @property
+    def is_compiled(self) -> bool:
+        return self._compile_field is None
+
+    def compile(self):
+        if self._compile_field is not None:
+            resolver, args, type_ = self._compile_field()
+            # Mounted as gpt.Field does, e.g. "gpt.String()" into an Argument.
+            self._resolver, self._args, self._type = resolver, to_arguments(args), type_
+            self._compile_field = None
+
+    @property
+    def type(self):
+        self.compile()
+        return super().type
+
+    @property
+    def args(self) -> Dict[str, gpt.Argument]:
+        self.compile()
+        return self._args
+
+    @args.setter
+    def args(self, value: Dict[str, gpt.Argument]):
+        self._args = value
+
+    @property
+    def resolver(self) -> Callable:
+        self.compile()
+        return self._resolver
+
+    @resolver.setter
+    def resolver(self, value: Callable):
+        self._resolver = value
+
+
+class SubscriptionField(gpt.Field):
+    """Field of a subscription type, streaming events of ``subscribe``."""
+
+    def __init__(self, type_, subscribe: Callable, **kwargs):
+        super().__init__(type_, **kwargs)
+        self.subscribe = subscribe
+
+    def wrap_subscribe(self, parent_subscribe: Optional[Callable]) -> Callable:
+        return self.subscribe
@@ -0,0 +1,125 @@
+import dataclasses
+from typing import Any, Callable, Dict, get_type_hints, List, NamedTuple, Optional
+
+from graphene import types as gpt
+
+from .types import Annotation, ContextEnum, GrapheneType
+
+MISSING: Any = dataclasses.MISSING
+
+
+class InputFieldSpec(NamedTuple):
+    name: str
+    annotation: Annotation
+    default: Any = MISSING
+    default_factory: Any = MISSING
+    optional: bool = False
+
+
+def is_dataclass_type(cls: type) -> bool:
+    return dataclasses.is_dataclass(cls)
+
+
+def is_namedtuple_type(cls: type) -> bool:
+    return issubclass(cls, tuple) and hasattr(cls, "_fields")
+
+
+def is_typeddict_type(cls: type) -> bool:
+    # typing.is_typeddict is only in python 3.10+.
+    return issubclass(cls, dict) and hasattr(cls, "__total__")
+
+
+def is_input_class(cls: type) -> bool:
+    return is_dataclass_type(cls) or is_namedtuple_type(cls) or is_typeddict_type(cls)
+
+
+def input_field_specs(cls: type) -> List[InputFieldSpec]:
+    hints = get_type_hints(cls)
+    if is_dataclass_type(cls):
+        return [
+            InputFieldSpec(
+                field.name,
+                hints[field.name],
+                field.default,
+                field.default_factory,  # type: ignore
+                field.default is not MISSING or field.default_factory is not MISSING,
+            )
+            for field in dataclasses.fields(cls)
+            if field.init
+        ]
+    elif is_namedtuple_type(cls):
+        defaults = getattr(cls, "_field_defaults", {})
+        return [
+            InputFieldSpec(
+                name,
+                hints.get(name, Any),
+                defaults.get(name, MISSING),
+                optional=name in defaults,
+            )
+            for name in cls._fields  # type: ignore
+        ]
+    optional_keys = getattr(
+        cls, "__optional_keys__", () if cls.__total__ else hints  # type: ignore
+    )
+    return [
+        InputFieldSpec(name, annotation, optional=name in optional_keys)
+        for name, annotation in hints.items()
+    ]
+
+
+def make_converter(cls: type, specs: List[InputFieldSpec]) -> Callable[[Dict], Any]:
+    """
+    Function building ``cls`` from the dict graphql-core coerced an input
+    object into. Its code is generated once, so that a call is one
+    constructor call with every field spelled out. Nested input objects are
+    converted by their own converters before it is called.
+    """
+    if is_typeddict_type(cls):
+        return dict
+
+    namespace: Dict[str, Any] = {"cls": cls}
+    params = []
+    for index, spec in enumerate(specs):
+        key = repr(spec.name)
+        if spec.default_factory is not MISSING:
+            namespace[f"factory_{index}"] = spec.default_factory
+            value = f"value[{key}] if {key} in value else factory_{index}()"
+        elif spec.default is not MISSING:
+            namespace[f"default_{index}"] = spec.default
+            value = f"value.get({key}, default_{index})"
+        else:
+            # Fields are nullable unless annotated otherwise, so may be left out.
+            value = f"value.get({key})"
+        params.append(f"{spec.name}={value}")
+
+    source = f"def convert(value):\n    return cls({', '.join(params)})\n"
+    exec(compile(source, f"<input converter of {cls.__qualname__}>", "exec"), namespace)
+    return namespace["convert"]
+
+
+def input_type_name(cls: type) -> str:
+    name = cls.__name__
+    return name if name.endswith("Input") else f"{name}Input"
+
+
+def compile_input_type(
+    cls: type,
+    compile_field: Callable[[Annotation, Optional[ContextEnum]], GrapheneType],
+) -> GrapheneType:
+    """``InputObjectType`` of dataclass, NamedTuple or TypedDict ``cls``."""
+    specs = input_field_specs(cls)
+    attrs: Dict[str, Any] = {}
+    for spec in specs:
+        type_ = compile_field(spec.annotation, ContextEnum.INPUT_FIELD)
+        if spec.optional and isinstance(type_, gpt.NonNull):
+            # May be left out, as the converter fills in the default.
+            type_ = type_.of_type
+        attrs[spec.name] = gpt.InputField(type_)
+    attrs["Meta"] = type(
+        "Meta",
+        (),
+        {"name": input_type_name(cls), "container": make_converter(cls, specs)},
+    )
+    input_type = type(input_type_name(cls), (gpt.InputObjectType,), attrs)
+    input_type.input_class = cls
+    return input_type
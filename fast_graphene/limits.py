@@ -0,0 +1,58 @@
+from asyncio import AbstractEventLoop, get_running_loop, Semaphore
+from time import perf_counter
+from typing import Dict, Optional
+
+
+class ConcurrencyLimit:
+    """
+    Caps how many calls of a dependency or resolver run at once across every
+    operation in flight, and records how long calls waited for a slot.
+    """
+
+    def __init__(self, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.calls = 0
+        self.waiting = 0
+        self.running = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._loop: Optional[AbstractEventLoop] = None
+        self._semaphore: Optional[Semaphore] = None
+
+    def _get_semaphore(self) -> Semaphore:
+        # Semaphore is bound to the loop it is first used in.
+        loop = get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._semaphore = loop, Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def __aenter__(self):
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        start = perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        wait = perf_counter() - start
+        self.calls += 1
+        self.running += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    async def __aexit__(self, *exc_info):
+        self.running -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "running": self.running,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "mean_wait": self.total_wait / self.calls if self.calls else 0.0,
+        }
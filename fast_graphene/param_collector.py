@@ -1,21 +1,90 @@
 from inspect import Parameter, signature
-from typing import Callable, Dict, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
 
 from graphene import types as gpt
 
 from .annot_compiler import AnnotCompiler
-from .types import ParamValue
+from .cache import CachePolicy
+from .types import ExecutionEnum, ParamValue, ScopeEnum
 
 
 class DependOn:
-    def __init__(self, func):
+    def __init__(
+        self,
+        func: Callable,
+        *,
+        scope: Union[ScopeEnum, str] = ScopeEnum.CALL,
+        cache: Optional[CachePolicy] = None,
+        max_concurrency: Optional[int] = None,
+        execution: Union[ExecutionEnum, str] = ExecutionEnum.DEFAULT,
+    ):
         self.func = func
+        self.scope = ScopeEnum(scope)
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.execution = ExecutionEnum(execution)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DependOn):
+            return NotImplemented
+        return (
+            self.func is other.func
+            and self.scope is other.scope
+            and self.cache is other.cache
+            and self.max_concurrency == other.max_concurrency
+            and self.execution is other.execution
+        )
+
+    def __hash__(self):
+        return hash(
+            (
+                self.func,
+                self.scope,
+                id(self.cache),
+                self.max_concurrency,
+                self.execution,
+            )
+        )
+
+    def __repr__(self):
+        return f"<DependOn {self.func} scope={self.scope.value}>"
+
+
+class BatchDependOn(DependOn):
+    """
+    Batched counterpart of ``DependOn``. ``key`` is resolved like a dependency
+    for every resolver call, and ``func`` gets every key gathered in the same
+    event loop tick at once and returns results in key order. It is always
+    call scoped, as loaded keys are cached for the operation already through
+    ``RequestScope``.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        key: Callable,
+        *,
+        max_concurrency: Optional[int] = None,
+    ):
+        super().__init__(func, max_concurrency=max_concurrency)
+        self.key = key
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BatchDependOn):
+            return NotImplemented
+        return super().__eq__(other) and self.key is other.key
+
+    def __hash__(self):
+        return hash((self.func, self.key, self.max_concurrency))
+
+    def __repr__(self):
+        return f"<BatchDependOn {self.func} key={self.key}>"
 
 
 def interpret_params(
     func: Callable,
     annot_compiler: Optional[AnnotCompiler] = None,
-) -> Tuple[Dict[str, gpt.Argument], Dict[str, Callable]]:
+) -> Tuple[Dict[str, gpt.Argument], Dict[str, DependOn]]:
     sig = signature(func)
     annot_compiler = annot_compiler or AnnotCompiler()
 
@@ -32,12 +101,15 @@ def interpret_params(
         if isinstance(default, gpt.Argument):
             args[name] = default
         elif isinstance(default, DependOn):
-            depend_ons[name] = default.func
+            depend_ons[name] = default
         elif default or annot:
             # TODO: Check if default value is correct to annot
             type_ = annot or type(default)
             compiled = annot_compiler.compile(type_)
-            args[name] = gpt.Argument(compiled, default_value=default)
+            if param.default is Parameter.empty:
+                args[name] = gpt.Argument(compiled)
+            else:
+                args[name] = gpt.Argument(compiled, default_value=default)
         else:
             raise ValueError(
                 f'Paramter "{name}" of function "{func}" doesn\'t have default value or annotaion.'
@@ -49,4 +121,5 @@ def interpret_params(
 def pick_used_params_only(
     used_arg_names: Iterable[str], args: Dict[str, ParamValue]
 ) -> Dict[str, ParamValue]:
-    return {name: args[name] for name in used_arg_names}
+    # GraphQL omits nullable arguments without default value.
+    return {name: args.get(name) for name in used_arg_names}
@@ -0,0 +1,131 @@
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from .cache import freeze
+
+_current_profile: ContextVar[Optional["OperationProfile"]] = ContextVar(
+    "fast_graphene_profile", default=None
+)
+
+
+class ProfilingWarning(UserWarning):
+    pass
+
+
+class Finding(NamedTuple):
+    pattern: str  # "n+1" or "redundant"
+    func: Callable
+    message: str
+
+
+def _name(func: Callable) -> str:
+    return getattr(func, "__qualname__", repr(func))
+
+
+class FunctionProfile:
+    def __init__(self, func: Callable, kind: str):
+        self.func = func
+        self.kind = kind
+        self.calls = 0
+        self.parent_types: Counter = Counter()
+        self.inputs: Counter = Counter()
+        self.identical: Counter = Counter()
+
+    def record(self, parent: Any, args: Dict[str, Any], result: Any):
+        frozen_args = freeze(tuple(sorted(args.items())))
+        self.calls += 1
+        self.parent_types[type(parent).__name__] += 1
+        self.inputs[(frozen_args, id(parent))] += 1
+        self.identical[(frozen_args, freeze(result))] += 1
+
+
+class OperationProfile:
+    """Calls of every resolver and dependency during one operation."""
+
+    def __init__(self, threshold: int = 10):
+        self.threshold = threshold
+        self.functions: Dict[Callable, FunctionProfile] = {}
+
+    def record(
+        self,
+        func: Callable,
+        kind: str,
+        parent: Any,
+        args: Dict[str, Any],
+        result: Any = None,
+    ):
+        if func not in self.functions:
+            self.functions[func] = FunctionProfile(func, kind)
+        self.functions[func].record(parent, args, result)
+
+    def findings(self) -> List[Finding]:
+        findings = []
+        for profile in self.functions.values():
+            if profile.kind != "dependency" or profile.calls < self.threshold:
+                continue
+
+            name = _name(profile.func)
+            parent_types = ", ".join(sorted(profile.parent_types))
+            identical = max(profile.identical.values())
+            if identical >= self.threshold:
+                findings.append(
+                    Finding(
+                        "redundant",
+                        profile.func,
+                        f"identical dependency {name} computed {identical} times "
+                        f'(parents: {parent_types}), consider scope="request".',
+                    )
+                )
+            elif len(profile.inputs) >= self.threshold:
+                findings.append(
+                    Finding(
+                        "n+1",
+                        profile.func,
+                        f"{name} ran {profile.calls} times with "
+                        f"{len(profile.inputs)} distinct inputs "
+                        f"(parents: {parent_types}), consider BatchDependOn.",
+                    )
+                )
+        return findings
+
+    def report(self) -> str:
+        lines = [
+            f"{profile.kind:<10} {profile.calls:>6}  {_name(profile.func)}"
+            for profile in sorted(
+                self.functions.values(), key=lambda profile: -profile.calls
+            )
+        ]
+        lines.extend(finding.message for finding in self.findings())
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Development profiling mode of ``Builder``. Wrap execution of an operation
+    with ``operation()`` to count resolver and dependency calls of it and
+    report N+1 and redundant dependency patterns.
+    """
+
+    def __init__(self, threshold: int = 10, warn: bool = True):
+        self.threshold = threshold
+        self.warn = warn
+
+    @staticmethod
+    def current() -> Optional[OperationProfile]:
+        return _current_profile.get()
+
+    @contextmanager
+    def operation(self) -> Iterator[OperationProfile]:
+        profile = OperationProfile(self.threshold)
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+
+        if self.warn:
+            for finding in profile.findings():
+                warnings.warn(finding.message, ProfilingWarning, stacklevel=3)
@@ -0,0 +1,209 @@
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from graphene import types as gpt
+from graphene.utils.str_converters import to_camel_case
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    get_named_type,
+    GraphQLIncludeDirective,
+    GraphQLNamedType,
+    GraphQLSkipDirective,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    value_from_ast_untyped,
+)
+from graphql.execution.values import get_argument_values, get_directive_values
+
+
+class SelectedField:
+    """Field requested by the client, with what is requested under it."""
+
+    __slots__ = ("name", "alias", "arguments", "selection", "python_name")
+
+    def __init__(
+        self,
+        name: str,
+        alias: Optional[str] = None,
+        arguments: Optional[Dict[str, Any]] = None,
+        python_name: Optional[str] = None,
+    ):
+        self.name = name
+        self.alias = alias
+        self.arguments = arguments or {}
+        self.selection = Selection()
+        # Name in graphene type, e.g. "first_name" for "firstName".
+        self.python_name = python_name or name
+
+    def __repr__(self) -> str:
+        return f"<SelectedField {self.name} {self.arguments} {self.selection}>"
+
+
+class Selection:
+    """
+    Fields requested under a field, by response key, with fragments merged
+    in and fields skipped by ``@skip`` or ``@include`` left out.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self):
+        self.fields: Dict[str, SelectedField] = {}
+
+    @property
+    def names(self) -> Set[str]:
+        """GraphQL names of requested fields, as written by the client."""
+        return {field.name for field in self.fields.values()}
+
+    @property
+    def python_names(self) -> Set[str]:
+        """Names of requested fields in graphene types, e.g. columns to fetch."""
+        return {field.python_name for field in self.fields.values()}
+
+    def get(self, name: str) -> Optional[SelectedField]:
+        """First requested field named ``name``, whatever its alias."""
+        for field in self.fields.values():
+            if field.name == name:
+                return field
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __iter__(self) -> Iterator[SelectedField]:
+        return iter(self.fields.values())
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __bool__(self) -> bool:
+        return bool(self.fields)
+
+    def __repr__(self) -> str:
+        return f"<Selection {list(self.fields)}>"
+
+
+def is_included(node: Any, variables: Dict[str, Any]) -> bool:
+    skip = get_directive_values(GraphQLSkipDirective, node, variables)
+    if skip is not None and skip["if"]:
+        return False
+    include = get_directive_values(GraphQLIncludeDirective, node, variables)
+    return include is None or include["if"]
+
+
+_PYTHON_NAMES: "WeakKeyDictionary[type, Dict[str, str]]" = WeakKeyDictionary()
+
+
+def python_name(parent_type: Optional[GraphQLNamedType], name: str) -> str:
+    """Name of field ``name`` of ``parent_type`` in its graphene type."""
+    graphene_type = getattr(parent_type, "graphene_type", None)
+    if graphene_type is None:
+        return name
+    names = _PYTHON_NAMES.get(graphene_type)
+    if names is None:
+        # Schema may or may not camelCase names, so both are mapped.
+        names = {}
+        for field_name, field in graphene_type._meta.fields.items():
+            name_ = getattr(field, "name", None)
+            names[name_ or field_name] = field_name
+            names.setdefault(name_ or to_camel_case(field_name), field_name)
+        _PYTHON_NAMES[graphene_type] = names
+    return names.get(name, name)
+
+
+def argument_values(
+    node: FieldNode,
+    parent_type: Optional[GraphQLNamedType],
+    variables: Dict[str, Any],
+) -> Dict[str, Any]:
+    field_def = getattr(parent_type, "fields", {}).get(node.name.value)
+    if field_def is not None:
+        return get_argument_values(field_def, node, variables)
+    # Meta fields such as "__typename" are not in the schema.
+    return {
+        argument.name.value: value_from_ast_untyped(argument.value, variables)
+        for argument in node.arguments
+    }
+
+
+def collect_selection(
+    selection: Selection,
+    selection_set: Optional[SelectionSetNode],
+    parent_type: Optional[GraphQLNamedType],
+    info: gpt.ResolveInfo,
+):
+    if selection_set is None:
+        return
+
+    variables = info.variable_values
+    for node in selection_set.selections:
+        if not is_included(node, variables):
+            continue
+
+        if isinstance(node, FieldNode):
+            key = node.alias.value if node.alias else node.name.value
+            field = selection.fields.get(key)
+            if field is None:
+                field = SelectedField(
+                    node.name.value,
+                    node.alias.value if node.alias else None,
+                    argument_values(node, parent_type, variables),
+                    python_name(parent_type, node.name.value),
+                )
+                selection.fields[key] = field
+            field_def = getattr(parent_type, "fields", {}).get(node.name.value)
+            field_type = get_named_type(field_def.type) if field_def else None
+            collect_selection(field.selection, node.selection_set, field_type, info)
+        elif isinstance(node, InlineFragmentNode):
+            type_ = parent_type
+            if node.type_condition is not None:
+                type_ = info.schema.get_type(node.type_condition.name.value)
+            collect_selection(selection, node.selection_set, type_, info)
+        elif isinstance(node, FragmentSpreadNode):
+            fragment = info.fragments.get(node.name.value)
+            if fragment is not None:
+                type_ = info.schema.get_type(fragment.type_condition.name.value)
+                collect_selection(selection, fragment.selection_set, type_, info)
+
+
+# Per operation, selections made with one set of variable values, keyed by
+# path without list indices and by parent type. Made again for new values.
+SelectionCache = Tuple[Dict[str, Any], Dict[Tuple[Tuple[str, ...], str], Selection]]
+_CACHE: "WeakKeyDictionary[OperationDefinitionNode, SelectionCache]" = (
+    WeakKeyDictionary()
+)
+
+
+def selection_of(info: gpt.ResolveInfo) -> Selection:
+    """``Selection`` under field being resolved, made once per field path."""
+    variables = info.variable_values
+    cached = _CACHE.get(info.operation)
+    if cached is None or cached[0] is not variables:
+        cached = (variables, {})
+        _CACHE[info.operation] = cached
+
+    path = tuple(key for key in info.path.as_list() if isinstance(key, str))
+    key = (path, info.parent_type.name)
+    try:
+        return cached[1][key]
+    except KeyError:
+        pass
+
+    selection = Selection()
+    return_type = get_named_type(info.return_type)
+    for node in info.field_nodes:
+        collect_selection(selection, node.selection_set, return_type, info)
+    cached[1][key] = selection
+    return selection
+
+
+def get_selection(parent: Any, info: gpt.ResolveInfo) -> Selection:
+    """
+    Dependency giving what the client selected under the current field, e.g.::
+
+        def load_user(parent, info, selection=DependOn(get_selection)):
+            return fetch_user(columns=selection.python_names)
+    """
+    return selection_of(info)
@@ -0,0 +1,168 @@
+from asyncio import CancelledError, create_task, Event
+from collections import deque
+from functools import wraps
+from inspect import isasyncgenfunction
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Deque, Optional, Union
+
+from graphene import types as gpt
+
+from .dependencies import (
+    AppScope,
+    Dependency,
+    DependencyChannel,
+    get_request_scope,
+)
+from .param_collector import pick_used_params_only
+from .tracing import Tracer
+from .types import OverflowEnum
+
+
+class _End:
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class EventBuffer:
+    """
+    Events produced ahead of a slow subscriber, at most ``size`` of them.
+    When full, ``overflow`` decides what happens to the next event:
+
+    - ``"block"``: the producer waits for room.
+    - ``"drop_oldest"``: the oldest buffered event is dropped.
+    - ``"drop_newest"``: the new event is dropped.
+    - ``"coalesce"``: the new event replaces the newest buffered one, so
+      the subscriber always gets the latest state.
+    """
+
+    def __init__(self, size: int, overflow: Union[OverflowEnum, str]):
+        if size < 1:
+            raise ValueError("Buffer size must be at least 1.")
+        self.size = size
+        self.overflow = OverflowEnum(overflow)
+        self.items: Deque[Any] = deque()
+        self.dropped = 0
+        self._readable = Event()
+        self._writable = Event()
+
+    async def put(self, item: Any):
+        while len(self.items) >= self.size:
+            if self.overflow is OverflowEnum.BLOCK:
+                self._writable.clear()
+                await self._writable.wait()
+                continue
+            elif self.overflow is OverflowEnum.DROP_NEWEST:
+                self.dropped += 1
+                return
+            elif self.overflow is OverflowEnum.DROP_OLDEST:
+                self.items.popleft()
+            else:
+                self.items.pop()
+            self.dropped += 1
+
+        self.items.append(item)
+        self._readable.set()
+
+    def close(self, error: Optional[BaseException] = None):
+        # Goes beyond size, as nothing is put after it.
+        self.items.append(_End(error))
+        self._readable.set()
+
+    async def get(self) -> Any:
+        while not self.items:
+            self._readable.clear()
+            await self._readable.wait()
+        item = self.items.popleft()
+        self._writable.set()
+        return item
+
+
+async def buffer_events(
+    source: AsyncIterator, size: int, overflow: Union[OverflowEnum, str]
+) -> AsyncGenerator:
+    """Pull events of source in a task, yielding them through ``EventBuffer``."""
+    buffer = EventBuffer(size, overflow)
+
+    async def produce():
+        try:
+            async for item in source:
+                await buffer.put(item)
+        except Exception as exc:
+            buffer.close(exc)
+        else:
+            buffer.close()
+
+    task = create_task(produce())
+    try:
+        while True:
+            item = await buffer.get()
+            if isinstance(item, _End):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        task.cancel()
+        try:
+            await task
+        except CancelledError:
+            pass
+
+
+def compile_subscription(
+    func: Callable,
+    dependency: Dependency,
+    tracer: Optional[Tracer] = None,
+    app_scope: Optional[AppScope] = None,
+    buffer_size: Optional[int] = None,
+    overflow: Union[OverflowEnum, str] = OverflowEnum.BLOCK,
+) -> Callable:
+    """
+    Subscribe function of an async generator resolver. Dependencies are
+    resolved once per subscription, and generator dependencies stay open
+    until the stream ends or the subscriber goes away.
+    """
+    if not isasyncgenfunction(func):
+        raise TypeError(f'Subscription "{func}" must be an async generator.')
+    if buffer_size is not None:
+        # Fail on definition rather than on first subscription.
+        EventBuffer(buffer_size, overflow)
+
+    plan = dependency.plan
+    used_arg_names = tuple(dependency.arguments.keys())
+    size = dependency.tree_size
+
+    @wraps(func)
+    async def subscribe(parent: Any, info: gpt.ResolveInfo, **kwargs):
+        channel = DependencyChannel(
+            size,
+            parent,
+            info=info,
+            scope=get_request_scope(info),
+            app_scope=app_scope,
+            tracer=tracer,
+            **kwargs,
+        )
+        events = None
+        try:
+            await plan.run(channel)
+            events = func(
+                parent,
+                info,
+                **pick_used_params_only(used_arg_names, kwargs),
+                **channel.values_of(dependency),
+            )
+            stream = events
+            if buffer_size is not None:
+                stream = buffer_events(events, buffer_size, overflow)
+            try:
+                async for event in stream:
+                    yield event
+            finally:
+                if stream is not events:
+                    await stream.aclose()
+        finally:
+            if events is not None:
+                await events.aclose()
+            await channel.release()
+
+    return subscribe
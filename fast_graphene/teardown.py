@@ -0,0 +1,70 @@
+import logging
+from asyncio import create_task, gather, Semaphore, Task
+from typing import Callable, Optional, Set, Union
+
+from .dependencies import DependencyChannel
+from .types import TeardownEnum
+
+logger = logging.getLogger("fast_graphene")
+
+
+def log_teardown_error(exc: BaseException):
+    logger.error("Generator dependency teardown failed.", exc_info=exc)
+
+
+class TeardownPolicy:
+    """
+    Decides when generator dependencies of a resolver are released.
+
+    - ``"inline"``: before the field result is returned. Errors propagate.
+    - ``"deferred"``: in a background task after the result is handed back.
+    - ``"operation"``: when ``RequestScope`` of the operation closes, or
+      deferred when there is none.
+
+    Background teardowns run at most ``max_concurrency`` at once, and their
+    errors are passed to ``on_error``, which logs them by default.
+    """
+
+    def __init__(
+        self,
+        mode: Union[TeardownEnum, str] = TeardownEnum.INLINE,
+        *,
+        max_concurrency: Optional[int] = None,
+        on_error: Callable[[BaseException], None] = log_teardown_error,
+    ):
+        self.mode = TeardownEnum(mode)
+        self.max_concurrency = max_concurrency
+        self.on_error = on_error
+        self.tasks: Set[Task] = set()
+        self._semaphore: Optional[Semaphore] = None
+
+    async def release(self, channel: DependencyChannel):
+        if not channel.generator_stack:
+            return
+        elif self.mode is TeardownEnum.INLINE:
+            await channel.release()
+        elif self.mode is TeardownEnum.OPERATION and channel.scope is not None:
+            channel.scope.adopt(channel)
+        else:
+            task = create_task(self._release_in_background(channel))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _release_in_background(self, channel: DependencyChannel):
+        if self.max_concurrency is not None and self._semaphore is None:
+            # Created lazily to bind the running loop.
+            self._semaphore = Semaphore(self.max_concurrency)
+
+        try:
+            if self._semaphore is None:
+                await channel.release()
+            else:
+                async with self._semaphore:
+                    await channel.release()
+        except Exception as exc:
+            self.on_error(exc)
+
+    async def drain(self):
+        """Wait for every background teardown, e.g. on shutdown."""
+        while self.tasks:
+            await gather(*self.tasks)
@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:  # Tracer is used without graphene loaded, e.g. by sinks.
+    from graphene import types as gpt
+
+
+class Span:
+    __slots__ = ("kind", "name", "attributes", "start_ns", "end_ns", "error", "handle")
+
+    def __init__(self, kind: str, name: str, attributes: Dict[str, Any]):
+        self.kind = kind
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.handle: Any = None  # For sinks to keep their own span object.
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        if self.end_ns is None:
+            return None
+        return self.end_ns - self.start_ns
+
+    def __repr__(self):
+        return f"<Span {self.name} {self.duration_ns}ns>"
+
+
+class TraceSink:
+    """Receives spans of a ``Tracer``. Override methods to export them."""
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        pass
+
+
+class InMemorySink(TraceSink):
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def on_end(self, span: Span):
+        self.spans.append(span)
+
+    def by_kind(self, kind: str) -> List[Span]:
+        return [span for span in self.spans if span.kind == kind]
+
+    def clear(self):
+        self.spans.clear()
+
+
+class OpenTelemetrySink(TraceSink):
+    """
+    Exports spans through an OpenTelemetry tracer, e.g.
+    ``OpenTelemetrySink(opentelemetry.trace.get_tracer(__name__))``.
+    """
+
+    def __init__(self, tracer: Any):
+        self.tracer = tracer
+
+    def on_start(self, span: Span):
+        span.handle = self.tracer.start_span(
+            span.name,
+            attributes={
+                f"graphql.{key}": value
+                for key, value in span.attributes.items()
+                if value is not None
+            },
+        )
+
+    def on_end(self, span: Span):
+        if span.error is not None:
+            span.handle.record_exception(span.error)
+        span.handle.end()
+
+
+def _func_name(func: Any) -> str:
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+class Tracer:
+    """
+    Emits spans of resolvers, dependencies, generator teardowns and waits for
+    the thread pool to sinks. Pass it to ``Builder(tracer=...)``; without it
+    nothing is traced.
+    """
+
+    def __init__(self, *sinks: TraceSink):
+        self.sinks = list(sinks)
+
+    def start(
+        self,
+        kind: str,
+        func: Callable,
+        info: Optional["gpt.ResolveInfo"] = None,
+        parent: Any = None,
+    ) -> Span:
+        parent_type = getattr(info, "parent_type", None)
+        func_name = _func_name(func)
+        span = Span(
+            kind,
+            f"{kind} {func_name}",
+            {
+                "kind": kind,
+                "function": func_name,
+                "field_name": getattr(info, "field_name", None),
+                "parent_type": getattr(parent_type, "name", None),
+                "parent": type(parent).__name__,
+            },
+        )
+        for sink in self.sinks:
+            sink.on_start(span)
+        return span
+
+    def end(self, span: Span, error: Optional[BaseException] = None):
+        span.end_ns = perf_counter_ns()
+        span.error = error
+        for sink in self.sinks:
+            sink.on_end(span)
+
+    @contextmanager
+    def span(
+        self,
+        kind: str,
+        func: Callable,
+        info: Optional["gpt.ResolveInfo"] = None,
+        parent: Any = None,
+    ) -> Iterator[Span]:
+        span = self.start(kind, func, info, parent)
+        try:
+            yield span
+        except BaseException as exc:
+            self.end(span, exc)
+            raise
+        else:
+            self.end(span)
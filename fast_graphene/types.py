@@ -40,6 +40,30 @@ class ContextEnum(Enum):
     INPUT_FIELD = "input_field"
 
 
+class ScopeEnum(Enum):
+    CALL = "call"
+    REQUEST = "request"
+    APP = "app"
+
+
+class ExecutionEnum(Enum):
+    DEFAULT = "default"
+    PROCESS = "process"
+
+
+class OverflowEnum(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+
+
+class TeardownEnum(Enum):
+    INLINE = "inline"
+    DEFERRED = "deferred"
+    OPERATION = "operation"
+
+
 AnnotCompileResult = Tuple[GrapheneType, List[Annotation]]
 
 
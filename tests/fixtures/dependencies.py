@@ -53,11 +53,7 @@ def valid_dependency_tree_func(request) -> Tuple[Callable, List[Callable]]:
             )
         )
 
-        # TODO: Support for async generator
-        # Async generator dependency makes deadlock.
-        # When it makes deadlock, its type is coroutine.
-        # Figure out why, async generator's type is coroutine on runtime
-        depfunc_format = choice((FUNC_FORMAT, AFUNC_FORMAT, GEN_FORMAT))
+        depfunc_format = choice((FUNC_FORMAT, AFUNC_FORMAT, GEN_FORMAT, AGEN_FORMAT))
         for j in range(randint(1, 5)):  # func per depth
             func_name = f"dep_{i}__num_{j}"
             args = ", ".join(
@@ -38,3 +38,35 @@ def test_transfiler_enum(annotation):
     transfiled = annot_compiler.compile(origin)
     for name in transfiled._meta.enum.__members__.keys():
         assert getattr(expected, name, False)
+
+
+def test_compile_enum_once():
+    assert annot_compiler.compile(TestEnum) is AnnotCompiler().compile(TestEnum)
+    assert annot_compiler.compile(Optional[TestEnum]) is annot_compiler.compile(
+        Optional[TestEnum]
+    )
+
+
+def test_subclass_lookup_uses_most_specific_class():
+    class Base(gpt.ObjectType):
+        pass
+
+    class Special(Base):
+        pass
+
+    def compile_special(annotation, args, context=None):
+        return gpt.String, []
+
+    compiler = AnnotCompiler(subcls_annot_map={Base: compile_special}, type_registry={})
+
+    assert compiler.compile(Special) == gpt.String
+
+
+def test_custom_map_is_not_shadowed_by_registry():
+    def compile_as_string(annotation, args, context=None):
+        return gpt.String, []
+
+    assert issubclass(AnnotCompiler().compile(TestEnum), gpt.Enum)
+    compiler = AnnotCompiler(subcls_annot_map={Enum: compile_as_string})
+
+    assert compiler.compile(TestEnum) == gpt.String
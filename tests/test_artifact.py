@@ -0,0 +1,125 @@
+import json
+import subprocess
+import sys
+from asyncio import wait_for
+from enum import Enum
+
+import pytest
+from graphene import types as gpt
+
+import fast_graphene.artifact
+from fast_graphene import ArtifactError, Builder, DependOn, SchemaArtifact
+from fast_graphene.annot_compiler import AnnotCompiler
+from fast_graphene.artifact import func_hash
+from fast_graphene.param_collector import interpret_params
+
+
+class Color(Enum):
+    RED = 1
+    BLUE = 2
+
+
+def get_prefix(parent, info, color: Color) -> str:
+    return f"{color.name.lower()} "
+
+
+async def greet(parent, info, name: str = "world", prefix=DependOn(get_prefix)) -> str:
+    return f"{prefix}{name}"
+
+
+def build_schema(artifact: SchemaArtifact) -> gpt.Schema:
+    builder = Builder(artifact=artifact)
+
+    class Query(gpt.ObjectType):
+        hello = builder.field(greet)
+
+    return gpt.Schema(Query)
+
+
+@pytest.mark.asyncio
+async def test_artifact_round_trip(tmp_path):
+    path = str(tmp_path / "schema.json")
+    artifact = SchemaArtifact.load(path, missing_ok=True)
+    schema = build_schema(artifact)
+    assert artifact.hits == 0
+    artifact.dump(path, schema)
+
+    loaded = SchemaArtifact.load(path)
+    loaded_schema = build_schema(loaded)
+    assert loaded.hits == 3  # Parameters of both functions and return type.
+    assert str(loaded_schema) == loaded.sdl == str(schema)
+
+    result = await wait_for(
+        loaded_schema.execute_async('{ hello(color: BLUE, name: "you") }'), 5
+    )
+    assert not result.errors
+    assert result.data == {"hello": "blue you"}
+
+
+def test_artifact_rejects_changed_function(tmp_path):
+    path = tmp_path / "schema.json"
+    artifact = SchemaArtifact()
+    artifact.dump(str(path), build_schema(artifact))
+
+    data = json.loads(path.read_text())
+    data["functions"][f"{__name__}:greet"]["hash"] = "changed"
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ArtifactError):
+        build_schema(SchemaArtifact.load(str(path)))
+
+    data["version"] = 0
+    path.write_text(json.dumps(data))
+    with pytest.raises(ArtifactError):
+        SchemaArtifact.load(str(path))
+
+
+def test_artifact_hit_skips_interpreting(monkeypatch):
+    interpreted = []
+
+    def counted_interpret_params(func, annot_compiler=None):
+        interpreted.append(func)
+        return interpret_params(func, annot_compiler=annot_compiler)
+
+    monkeypatch.setattr(
+        fast_graphene.artifact, "interpret_params", counted_interpret_params
+    )
+    functions = [greet, get_prefix]
+    artifact = SchemaArtifact()
+    for func in functions:
+        artifact.interpret(func)
+    assert artifact.hits == 0
+    assert interpreted == functions
+
+    # As on a new start: functions not checked yet, compiler caches empty.
+    loaded = SchemaArtifact(artifact.records)
+    for func in functions:
+        loaded.interpret(func, AnnotCompiler())
+    assert loaded.hits == 2
+    assert interpreted == functions
+
+
+def test_func_hash_is_stable_across_processes():
+    # Imported by the name pytest gave this module, as it is part of the hash.
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; sys.path[:0] = {sys.path!r}\n"
+            "from fast_graphene.artifact import func_hash\n"
+            f"from {greet.__module__} import greet\n"
+            "print(func_hash(greet))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+    assert output == func_hash(greet)
+
+    def changed(parent, info, name: str = "world", prefix=DependOn(greet)) -> str:
+        pass
+
+    def original(parent, info, name: str = "world", prefix=DependOn(get_prefix)) -> str:
+        pass
+
+    assert func_hash(changed) != func_hash(original)
@@ -1,9 +1,11 @@
-from asyncio import wait_for
+from asyncio import run, wait_for
 
 import pytest
 from graphene import types as gpt
 
+from fast_graphene import BatchDependOn, DependOn, RequestScope, Tracer
 from fast_graphene.builder import Builder
+from fast_graphene.dependencies import DependencyScope
 
 
 @pytest.fixture
@@ -48,3 +50,376 @@ async def test_builder_execute(schema_with_builder: gpt.Schema):
         assert False
     assert not result.errors
     assert result.data["test"] == 1
+
+
+@pytest.mark.asyncio
+async def test_builder_request_scope(builder):
+    calls = []
+
+    def get_user(parent, info):
+        calls.append("setup")
+        yield "user"
+        calls.append("teardown")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def first(parent, info, user=DependOn(get_user, scope="request")) -> str:
+            return user
+
+        @builder.field
+        async def second(parent, info, user=DependOn(get_user, scope="request")) -> str:
+            return user
+
+    schema = gpt.Schema(Query)
+    async with RequestScope() as scope:
+        result = await wait_for(
+            schema.execute_async(
+                "query Query { first second }", context_value={"request_scope": scope}
+            ),
+            5,
+        )
+        assert calls == ["setup"]
+
+    assert not result.errors
+    assert result.data == {"first": "user", "second": "user"}
+    assert calls == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_builder_request_scope_owns_sub_dependencies(builder):
+    def get_session(parent, info):
+        session = {"open": True}
+        yield session
+        session["open"] = False
+
+    def get_user(parent, info, session=DependOn(get_session)):
+        return {"session": session}
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def first(
+            parent,
+            info,
+            session=DependOn(get_session),
+            user=DependOn(get_user, scope="request"),
+        ) -> bool:
+            return user["session"]["open"]
+
+        @builder.field
+        async def second(
+            parent, info, user=DependOn(get_user, scope="request")
+        ) -> bool:
+            return user["session"]["open"]
+
+    schema = gpt.Schema(Query)
+    async with RequestScope() as scope:
+        result = await wait_for(
+            schema.execute_async(
+                "query Query { first second }", context_value={"request_scope": scope}
+            ),
+            5,
+        )
+
+    assert not result.errors
+    # Session of user is released with the scope, not with the first field.
+    assert result.data == {"first": True, "second": True}
+
+
+@pytest.mark.asyncio
+async def test_builder_request_scope_is_keyed_by_arguments(builder):
+    calls = []
+
+    def get_id(parent, info, id: int) -> int:
+        return id
+
+    def get_user(parent, info, id=DependOn(get_id)) -> int:
+        calls.append(id)
+        return id
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def user(parent, info, user=DependOn(get_user, scope="request")) -> int:
+            return user
+
+    schema = gpt.Schema(Query)
+    async with RequestScope() as scope:
+        result = await wait_for(
+            schema.execute_async(
+                "{ a: user(id: 1) b: user(id: 2) c: user(id: 1) }",
+                context_value={"request_scope": scope},
+            ),
+            5,
+        )
+
+    assert not result.errors
+    assert result.data == {"a": 1, "b": 2, "c": 1}
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_builder_shares_arguments_with_dependencies(builder):
+    def get_user(parent, info, id: int) -> dict:
+        return {"id": id}
+
+    def get_posts(parent, info, id: int, user=DependOn(get_user)) -> int:
+        return user["id"] * 10
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def user(
+            parent, info, id: int, user=DependOn(get_user), posts=DependOn(get_posts)
+        ) -> int:
+            return id + user["id"] + posts
+
+    args = Query._meta.fields["user"].args
+    assert list(args) == ["id"]
+
+    result = await wait_for(gpt.Schema(Query).execute_async("{ user(id: 2) }"), 5)
+    assert not result.errors
+    assert result.data == {"user": 24}
+
+
+@pytest.mark.asyncio
+async def test_builder_batch_dependency(builder):
+    batches = []
+
+    async def load_names(keys):
+        batches.append(keys)
+        return [f"name{key}" for key in keys]
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def name(
+            parent,
+            info,
+            name=BatchDependOn(load_names, key=lambda parent, info: parent % 3),
+        ) -> str:
+            return name
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return list(range(6))
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { items { name } }"), 5)
+
+    assert not result.errors
+    assert [item["name"] for item in result.data["items"]] == [
+        f"name{i % 3}" for i in range(6)
+    ]
+    assert batches == [[0, 1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_builder_batch_dependency_in_request_scope(builder):
+    batches = []
+
+    async def load_values(keys):
+        batches.append(keys)
+        return [key * 10 for key in keys]
+
+    def get_key(parent, info):
+        return parent
+
+    with pytest.raises(TypeError):
+        BatchDependOn(load_values, key=get_key, scope="request")
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def value(
+            parent, info, value=BatchDependOn(load_values, key=get_key)
+        ) -> int:
+            return value
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return [1, 2, 3]
+
+    schema = gpt.Schema(Query)
+    async with RequestScope() as scope:
+        for _ in range(2):
+            result = await wait_for(
+                schema.execute_async(
+                    "{ items { value } }", context_value={"request_scope": scope}
+                ),
+                5,
+            )
+            assert not result.errors
+            assert result.data == {
+                "items": [{"value": 10}, {"value": 20}, {"value": 30}]
+            }
+
+    # Loaded once, then cached by the scope.
+    assert batches == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_builder_batch_dependency_with_unhashable_key(builder):
+    async def load_values(keys):
+        return keys
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def value(
+            parent,
+            info,
+            value=BatchDependOn(load_values, key=lambda parent, info: [parent]),
+        ) -> int:
+            return value
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return [1, 2]
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("{ items { value } }"), 5)
+
+    assert [error.message for error in result.errors] == ["unhashable type: 'list'"] * 2
+
+
+@pytest.mark.asyncio
+async def test_builder_lazy_field():
+    builder = Builder(lazy=True)
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, num: int = 0) -> int:
+            return num + 1
+
+        @builder.field(extra_args={"unused": gpt.String()})
+        async def extra(parent, info) -> str:
+            return "extra"
+
+    field = Query._meta.fields["test"]
+    assert not field.is_compiled
+
+    schema = gpt.Schema(Query)
+    assert field.is_compiled
+
+    result = await wait_for(
+        schema.execute_async('query Query { test(num: 1) extra(unused: "") }'), 5
+    )
+    assert not result.errors
+    assert result.data == {"test": 2, "extra": "extra"}
+
+
+def test_builder_compiles_sync_resolver_without_event_loop():
+    builder = Builder(lazy=True)
+    traced_builder = Builder(lazy=True, tracer=Tracer())
+
+    def test(parent, info, num: int = 0) -> int:
+        return num + 1
+
+    class Query(gpt.ObjectType):
+        plain = builder.field(test)
+        traced = traced_builder.field(test)
+
+    # Built at import of a module, with no loop running yet.
+    schema = gpt.Schema(Query)
+
+    result = run(wait_for(schema.execute_async("{ plain(num: 1) traced }"), 5))
+    assert not result.errors
+    assert result.data == {"plain": 2, "traced": 1}
+
+
+@pytest.mark.asyncio
+async def test_builder_app_scope():
+    builder = Builder()
+    calls = []
+
+    def get_pool(parent, info):
+        calls.append("setup")
+        yield "pool"
+        calls.append("teardown")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, pool=DependOn(get_pool, scope="app")) -> str:
+            return pool
+
+    schema = gpt.Schema(Query)
+    async with builder.lifespan():
+        assert calls == ["setup"]
+        for _ in range(2):
+            result = await wait_for(schema.execute_async("query Query { test }"), 5)
+            assert not result.errors
+            assert result.data["test"] == "pool"
+        assert calls == ["setup"]
+
+    assert calls == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_builder_app_scope_retries_failed_dependency():
+    builder = Builder()
+    calls = []
+
+    async def get_client(parent, info):
+        calls.append("setup")
+        if len(calls) == 1:
+            raise ValueError("boom")
+        return "client"
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, client=DependOn(get_client, scope="app")) -> str:
+            return client
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { test }"), 5)
+    assert [error.message for error in result.errors] == ["boom"]
+
+    for _ in range(2):
+        result = await wait_for(schema.execute_async("query Query { test }"), 5)
+        assert not result.errors
+        assert result.data["test"] == "client"
+    assert calls == ["setup", "setup"]
+    await builder.shutdown()
+
+
+def test_dependency_scope_is_abstract():
+    with pytest.raises(TypeError):
+        DependencyScope()
+
+
+def test_builder_app_scope_needs_app_scoped_dependencies(builder):
+    def get_user(parent, info):
+        return "user"
+
+    def get_client(parent, info, user=DependOn(get_user)):
+        return "client"
+
+    with pytest.raises(ValueError):
+
+        @builder.field
+        async def test(parent, info, client=DependOn(get_client, scope="app")) -> str:
+            return client
+
+
+@pytest.mark.asyncio
+async def test_builder_binds_arguments_by_name(builder):
+    def get_total(parent, info, n: int) -> int:
+        return n * 10
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        def plain(parent, info, a: int, b: int = 2) -> int:
+            return a - b
+
+        @builder.field
+        async def total(parent, info, m: int, total=DependOn(get_total)) -> int:
+            return total + (m or 0)
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(
+        schema.execute_async("{ plain(a: 5) total(n: 1) other: total(m: 3, n: 2) }"),
+        5,
+    )
+    assert not result.errors
+    assert result.data == {"plain": 3, "total": 10, "other": 23}
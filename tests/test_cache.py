@@ -0,0 +1,154 @@
+from asyncio import wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, CachePolicy, DependOn, FieldCache
+from fast_graphene.cache import CacheBackend, LRUCache, MISSING
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires():
+    cache = LRUCache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
+
+    cache.set("b", 2, ttl=60)
+    assert cache.get("b") == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_dependency():
+    builder = Builder()
+    calls = []
+
+    def get_tenant(parent, info):
+        calls.append("tenant")
+        return "tenant"
+
+    async def get_flags(parent, info, name: str, tenant=DependOn(get_tenant)):
+        calls.append(name)
+        return f"{tenant}:{name}"
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def flag(
+            parent, info, flags=DependOn(get_flags, cache=CachePolicy(ttl=60))
+        ) -> str:
+            return flags
+
+    schema = gpt.Schema(Query)
+    for name in ("a", "a", "b", "a"):
+        result = await wait_for(
+            schema.execute_async(f'query Query {{ flag(name: "{name}") }}'), 5
+        )
+        assert not result.errors
+        assert result.data["flag"] == f"tenant:{name}"
+
+    # Sub dependencies are part of the key, so they run on every call.
+    assert calls == ["tenant", "a", "tenant", "tenant", "b", "tenant"]
+
+
+@pytest.mark.asyncio
+async def test_cached_dependency_is_keyed_by_sub_dependencies():
+    builder = Builder()
+    calls = []
+
+    def current_user(parent, info):
+        return info.context["user"]
+
+    def get_perms(parent, info, user=DependOn(current_user)):
+        calls.append(user)
+        return f"perms-of-{user}"
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def perms(
+            parent, info, perms=DependOn(get_perms, cache=CachePolicy(ttl=60))
+        ) -> str:
+            return perms
+
+    schema = gpt.Schema(Query)
+    for user in ("alice", "bob", "alice"):
+        result = await wait_for(
+            schema.execute_async("{ perms }", context_value={"user": user}), 5
+        )
+        assert not result.errors
+        assert result.data["perms"] == f"perms-of-{user}"
+
+    assert calls == ["alice", "bob"]
+
+
+class DictBackend(CacheBackend):
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key, MISSING)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def clear(self):
+        self.data.clear()
+
+
+def test_cache_backend_must_implement_every_method():
+    class GetOnlyBackend(CacheBackend):
+        async def get(self, key):
+            return MISSING
+
+    with pytest.raises(TypeError):
+        GetOnlyBackend()
+    DictBackend()
+
+
+@pytest.mark.asyncio
+async def test_field_cache():
+    builder = Builder()
+    backend = DictBackend()
+    cache = FieldCache(ttl=60, backend=backend)
+    calls = []
+
+    def get_session(parent, info):
+        calls.append("session")
+        yield "session"
+
+    class Query(gpt.ObjectType):
+        @builder.field(cache=cache)
+        async def product(parent, info, id: int, session=DependOn(get_session)) -> str:
+            calls.append(id)
+            return f"product{id}"
+
+    schema = gpt.Schema(Query)
+
+    async def query(id):
+        result = await wait_for(
+            schema.execute_async(f"query Query {{ product(id: {id}) }}"), 5
+        )
+        assert not result.errors
+        return result.data["product"]
+
+    assert await query(1) == "product1"
+    assert await query(1) == "product1"
+    assert await query(2) == "product2"
+    assert calls == ["session", 1, "session", 2]
+    assert len(backend.data) == 2
+
+    await cache.invalidate(id=1)
+    assert await query(1) == "product1"
+    assert calls == ["session", 1, "session", 2, "session", 1]
@@ -0,0 +1,71 @@
+from typing import List
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, QueryCostAnalyzer, QueryCostError
+
+builder = Builder()
+
+
+class Author(gpt.ObjectType):
+    @builder.field(cost=5)
+    async def name(parent, info) -> str:
+        return "name"
+
+
+class Book(gpt.ObjectType):
+    title = gpt.String()
+
+    @builder.field(cost=2)
+    async def author(parent, info) -> Author:
+        return Author()
+
+
+class Query(gpt.ObjectType):
+    @builder.field(cost=lambda args: 1 + args["first"] // 10)
+    async def books(parent, info, first: int = 10) -> List[Book]:
+        return []
+
+    tags = gpt.List(gpt.String)
+
+
+schema = gpt.Schema(Query)
+
+
+@pytest.mark.parametrize(
+    "query, cost",
+    [
+        ("{ books { title } }", 2 + 10 * 1),
+        ("{ books(first: 30) { title author { name } } }", 4 + 30 * (1 + 2 + 5)),
+        ("{ books(first: $first) { title } }", 6 + 50 * 1),
+        ("{ ...Books } fragment Books on Query { books(first: 1) { title } }", 1 + 1),
+        ("{ tags __typename }", 1),
+    ],
+)
+def test_query_cost(query, cost):
+    analyzer = QueryCostAnalyzer(schema)
+    if "$first" in query:
+        query = query.replace("{ books", "query Q($first: Int) { books", 1)
+
+    assert analyzer.cost(query, variables={"first": 50}) == cost
+
+
+def test_query_cost_budget():
+    analyzer = QueryCostAnalyzer(schema, budget=100)
+
+    assert analyzer.check("{ books { title } }") == 12
+    with pytest.raises(QueryCostError):
+        analyzer.check("{ books(first: 100) { author { name } } }")
+
+
+def test_query_cost_ignores_negative_multiplier():
+    analyzer = QueryCostAnalyzer(schema, budget=100)
+    query = (
+        "{ a: books(first: 100) { author { name } }"
+        " b: books(first: -1000) { author { name } } }"
+    )
+
+    assert analyzer.cost("{ books(first: -1000) { author { name } } }") == 0
+    with pytest.raises(QueryCostError):
+        analyzer.check(query)
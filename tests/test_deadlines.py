@@ -0,0 +1,106 @@
+from asyncio import CancelledError, sleep
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, deadline, DependOn
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_cancels_siblings():
+    builder = Builder()
+    events = []
+
+    async def session(parent, info):
+        events.append("open")
+        yield "session"
+        events.append("close")
+
+    async def slow(parent, info, session=DependOn(session)):
+        try:
+            await sleep(10)
+        except CancelledError:
+            events.append("cancelled")
+            raise
+
+    async def broken(parent, info, session=DependOn(session)):
+        await sleep(0)
+        raise ValueError("broken")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def value(parent, info, a=DependOn(slow), b=DependOn(broken)) -> str:
+            return "never"
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { value }"), 5)
+    assert result.errors[0].message == "broken"
+    assert events == ["open", "cancelled", "close"]
+
+
+@pytest.mark.asyncio
+async def test_field_timeout():
+    builder = Builder()
+    events = []
+
+    async def slow(parent, info):
+        try:
+            await sleep(10)
+        except CancelledError:
+            events.append("cancelled")
+            raise
+
+    class Query(gpt.ObjectType):
+        @builder.field(timeout=0.01)
+        async def value(parent, info, result=DependOn(slow)) -> str:
+            return result
+
+        @builder.field(timeout=1)
+        async def fast(parent, info) -> str:
+            return "fast"
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { value fast }"), 5)
+    assert result.data == {"value": None, "fast": "fast"}
+    assert "Deadline exceeded" in result.errors[0].message
+    assert events == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_own_timeout_error_is_not_deadline():
+    builder = Builder()
+
+    class Query(gpt.ObjectType):
+        @builder.field(timeout=10)
+        async def value(parent, info) -> str:
+            raise AsyncTimeoutError("upstream timed out")
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { value }"), 5)
+    assert [error.message for error in result.errors] == ["upstream timed out"]
+
+
+@pytest.mark.asyncio
+async def test_operation_deadline():
+    builder = Builder()
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def slow(parent, info) -> str:
+            await sleep(10)
+
+        @builder.field
+        async def fast(parent, info) -> str:
+            return "fast"
+
+    schema = gpt.Schema(Query)
+    with deadline(0.2):
+        result = await wait_for(schema.execute_async("query Query { slow fast }"), 5)
+    assert result.data == {"slow": None, "fast": "fast"}
+    assert len(result.errors) == 1
+
+    with deadline(0):
+        result = await wait_for(schema.execute_async("query Query { fast }"), 5)
+    assert "Deadline exceeded" in result.errors[0].message
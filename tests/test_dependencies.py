@@ -1,7 +1,11 @@
-from asyncio import wait_for
+from asyncio import CancelledError, sleep, wait_for
+from inspect import signature
 
 import pytest
+from graphene import types as gpt
 
+import fast_graphene.dependencies
+from fast_graphene import Builder, DependOn
 from fast_graphene.dependencies import (
     build_dependency_tree,
     Dependency,
@@ -26,7 +30,7 @@ async def test_dependency_channel():
         return 1
 
     d = Dependency(r1)
-    chan = DependencyChannel([d], None, info=None)
+    chan = DependencyChannel(1, None, info=None)
 
     assert 1 == await wait_for(chan.get(d), 1)
 
@@ -41,7 +45,7 @@ def dependency_tree(valid_dependency_tree_func):
 async def test_dependency_channel_with_random_tree(dependency_tree):
     root, flated, _ = dependency_tree
     channel = DependencyChannel(
-        flated,
+        root.tree_size,
         parent=None,
         info=None,
     )
@@ -49,3 +53,200 @@ async def test_dependency_channel_with_random_tree(dependency_tree):
         await wait_for(root(None, None, {}, channel), 10)
     except Exception:
         assert False
+
+
+def test_execution_plan_order(dependency_tree):
+    root, flated, _ = dependency_tree
+    plan = root.plan
+
+    assert set(plan.dependencies) == set(flated)
+    seen = set()
+    for dependency in plan.dependencies:
+        assert set(dependency.dependencies) <= seen
+        seen.add(dependency)
+
+
+@pytest.mark.asyncio
+async def test_execution_plan_runs_shared_dependency_once():
+    calls = []
+
+    def shared(p, i):
+        calls.append("shared")
+        return 1
+
+    def left(p, i, value=DependOn(shared)):
+        return value
+
+    async def right(p, i, value=DependOn(shared)):
+        return value + 1
+
+    def root(p, i, left=DependOn(left), right=DependOn(right)):
+        return left + right
+
+    dependency = build_dependency_tree(root).dependency
+    assert not dependency.plan.is_inline
+
+    channel = DependencyChannel(dependency.tree_size, parent=None, info=None)
+    assert 3 == await wait_for(dependency(None, None, {}, channel), 1)
+    assert calls == ["shared"]
+
+
+@pytest.mark.asyncio
+async def test_execution_plan_does_not_wait_for_other_chains():
+    finished = []
+
+    async def slow(p, i):
+        await sleep(0.2)
+        finished.append("slow")
+
+    async def fast(p, i):
+        await sleep(0.01)
+        finished.append("fast")
+
+    async def after_fast(p, i, value=DependOn(fast)):
+        await sleep(0.01)
+        finished.append("after_fast")
+
+    def root(p, i, a=DependOn(slow), b=DependOn(after_fast)):
+        pass
+
+    dependency = build_dependency_tree(root).dependency
+    channel = DependencyChannel(dependency.tree_size, parent=None, info=None)
+    await wait_for(dependency(None, None, {}, channel), 1)
+    # Chain of "fast" goes on while "slow" still runs.
+    assert finished == ["fast", "after_fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_execution_plan_runs_sync_after_async():
+    async def first(p, i):
+        return 1
+
+    def second(p, i, value=DependOn(first)):
+        return value + 1
+
+    def root(p, i, value=DependOn(second)):
+        return value
+
+    dependency = build_dependency_tree(root).dependency
+    channel = DependencyChannel(dependency.tree_size, parent=None, info=None)
+    assert 2 == await wait_for(dependency(None, None, {}, channel), 1)
+
+
+@pytest.mark.asyncio
+async def test_execution_plan_cancels_others_on_error():
+    cancelled = []
+
+    async def slow(p, i):
+        try:
+            await sleep(1)
+        except CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def failing(p, i):
+        await sleep(0.01)
+        raise ValueError("boom")
+
+    def root(p, i, a=DependOn(slow), b=DependOn(failing)):
+        pass
+
+    dependency = build_dependency_tree(root).dependency
+    channel = DependencyChannel(dependency.tree_size, parent=None, info=None)
+    with pytest.raises(ValueError, match="boom"):
+        await wait_for(dependency(None, None, {}, channel), 1)
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_channel_pool():
+    builder = Builder(pool_channels=True)
+
+    def double(parent, info):
+        return parent * 2
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def value(parent, info, doubled=DependOn(double)) -> int:
+            return doubled
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return list(range(10))
+
+    schema = gpt.Schema(Query)
+    for _ in range(2):
+        result = await wait_for(schema.execute_async("{ items { value } }"), 5)
+        assert result.data["items"][3] == {"value": 6}
+
+    channels = builder.channel_pool.channels
+    assert 0 < len(channels) <= 10
+    assert all(channel.parent is None for channel in channels)
+    assert not hasattr(Dependency(double), "__dict__")
+
+
+def test_shared_dependency_is_built_once():
+    calls = []
+
+    def shared(p, i):
+        return 1
+
+    def make_level(lower):
+        def dependency(p, i, a=DependOn(lower[0]), b=DependOn(lower[1])):
+            return a + b
+
+        return dependency
+
+    level = [shared, shared]
+    for _ in range(30):
+        level = [make_level(level), make_level(level)]
+
+    original = fast_graphene.dependencies.interpret_params
+
+    def counted(func, *args, **kwargs):
+        calls.append(func)
+        return original(func, *args, **kwargs)
+
+    fast_graphene.dependencies.interpret_params = counted
+    try:
+        result = build_dependency_tree(level[0])
+    finally:
+        fast_graphene.dependencies.interpret_params = original
+
+    assert len(calls) == len(set(calls)) == 60
+    assert len(result.flated_dependencies) == 59
+    root = result.dependency
+    a, b = root.dependencies_map["a"], root.dependencies_map["b"]
+    assert a.dependencies_map["a"] is b.dependencies_map["a"]
+
+
+def test_dependency_cycle():
+    def first(p, i):
+        return 1
+
+    def second(p, i, value=DependOn(first)):
+        return value
+
+    first.__signature__ = signature(lambda p, i, value=DependOn(second): None)
+
+    def root(p, i, value=DependOn(second)):
+        return value
+
+    with pytest.raises(ValueError, match=r"second -> \S*first -> \S*second"):
+        build_dependency_tree(root)
+
+
+def test_shared_argument_types_must_agree():
+    def get_user(p, i, id: int):
+        return id
+
+    def get_name(p, i, id: str):
+        return id
+
+    def root(p, i, id: int, user=DependOn(get_user), name=DependOn(get_name)):
+        return user
+
+    with pytest.raises(TypeError, match='Argument "id"'):
+        build_dependency_tree(root)
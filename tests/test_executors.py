@@ -0,0 +1,49 @@
+import os
+from asyncio import wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn
+
+
+def square(parent, info, n: int) -> int:
+    assert parent is None and info is None
+    return n * n
+
+
+def render(parent, info, squared=DependOn(square, execution="process")) -> str:
+    return f"{squared} by {os.getpid()}"
+
+
+@pytest.mark.asyncio
+async def test_process_execution():
+    builder = Builder(process_workers=1)
+
+    class Query(gpt.ObjectType):
+        report = builder.field(execution="process")(render)
+
+    schema = gpt.Schema(Query)
+    async with builder.lifespan():
+        result = await wait_for(
+            schema.execute_async("query Query { report(n: 3) }"), 30
+        )
+        assert not result.errors
+        squared, pid = result.data["report"].split(" by ")
+        assert squared == "9"
+        assert int(pid) != os.getpid()
+
+    assert builder.process_pool._executor is None
+
+
+def test_process_execution_requires_sync_function():
+    builder = Builder()
+
+    async def fetch(parent, info) -> int:
+        return 1
+
+    with pytest.raises(TypeError):
+        builder.field(execution="process")(fetch)
+
+    with pytest.raises(TypeError):
+        builder.field(lambda parent, info, x=DependOn(fetch, execution="process"): x)
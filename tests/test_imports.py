@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+import fast_graphene
+
+# Generous, as it guards against pulling in graphene again, which alone
+# takes well over it, rather than against small regressions.
+IMPORT_BUDGET_SECONDS = 0.1
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.strip()
+
+
+def test_import_does_not_load_graphene():
+    output = run_python(
+        "import sys, fast_graphene\n"
+        "from fast_graphene import CachePolicy, ConcurrencyLimit, Profiler, Tracer\n"
+        "print('graphene' in sys.modules, 'concurrent.futures.process' in sys.modules)"
+    )
+    assert output == "False False"
+
+
+def test_import_time_budget():
+    elapsed = min(
+        float(
+            run_python(
+                "from time import perf_counter\n"
+                "start = perf_counter()\n"
+                "import fast_graphene\n"
+                "print(perf_counter() - start)"
+            )
+        )
+        for _ in range(3)
+    )
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_attributes():
+    for name in fast_graphene.__all__:
+        assert getattr(fast_graphene, name) is not None
+    assert fast_graphene.field.__self__ is fast_graphene.resolver.__self__
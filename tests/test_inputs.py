@@ -0,0 +1,108 @@
+from asyncio import wait_for
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, NamedTuple, Optional, TypedDict
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn
+from fast_graphene.annot_compiler import AnnotCompiler
+from fast_graphene.types import ContextEnum
+
+
+class Point(NamedTuple):
+    x: int
+    y: int = 0
+
+
+class Tags(TypedDict, total=False):
+    color: str
+
+
+@dataclass
+class Shape:
+    name: Optional[str]
+    points: List[Point] = field(default_factory=list)
+    tags: Optional[Tags] = None
+    closed: bool = False
+
+
+def test_input_type_is_cached():
+    compiler = AnnotCompiler()
+    shape_input = compiler.compile(Shape)
+
+    assert issubclass(shape_input, gpt.InputObjectType)
+    assert shape_input._meta.name == "ShapeInput"
+    assert AnnotCompiler().compile(Shape) is shape_input
+    assert compiler.compile(Point) is compiler.compile(Point)
+    assert shape_input._meta.fields["name"].type == gpt.NonNull(gpt.String)
+
+
+def test_input_class_is_not_output_type():
+    with pytest.raises(TypeError):
+        AnnotCompiler().compile(Shape, ContextEnum.FIELD)
+
+
+@pytest.mark.asyncio
+async def test_input_is_converted():
+    builder = Builder()
+    received = []
+
+    def get_offset(parent, info, origin: Point) -> int:
+        return origin.x if origin else 0
+
+    class Mutation(gpt.ObjectType):
+        @builder.field
+        async def draw(parent, info, shape: Shape, offset=DependOn(get_offset)) -> int:
+            received.append(shape)
+            return offset + len(shape.points)
+
+    class Query(gpt.ObjectType):
+        ok = gpt.Boolean()
+
+    schema = gpt.Schema(query=Query, mutation=Mutation)
+    result = await wait_for(
+        schema.execute_async(
+            "mutation($shape: ShapeInput!) {"
+            "  draw(shape: $shape, origin: {x: 10})"
+            "}",
+            variable_values={
+                "shape": {
+                    "name": "line",
+                    "points": [{"x": 1}, {"x": 2, "y": 3}],
+                    "tags": {"color": "red"},
+                }
+            },
+        ),
+        5,
+    )
+    assert not result.errors
+    assert result.data == {"draw": 12}
+    assert received == [
+        Shape("line", [Point(1, 0), Point(2, 3)], {"color": "red"}, False)
+    ]
+
+    result = await wait_for(
+        schema.execute_async('mutation { draw(shape: {name: "dot"}) }'), 5
+    )
+    assert not result.errors
+    assert received[-1] == Shape("dot")
+
+
+def test_input_type_of_custom_map_is_not_shared():
+    def compile_as_string(annotation, args, context=None):
+        return gpt.String, []
+
+    class Mode(Enum):
+        ON = 1
+
+    @dataclass
+    class Switch:
+        mode: Mode
+
+    shared = AnnotCompiler().compile(Switch)
+    custom = AnnotCompiler(subcls_annot_map={Enum: compile_as_string}).compile(Switch)
+
+    assert custom is not shared
+    assert custom._meta.fields["mode"].type == gpt.String
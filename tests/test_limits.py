@@ -0,0 +1,94 @@
+from asyncio import gather, sleep, wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, ConcurrencyLimit, DependOn
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_records_waits():
+    limit = ConcurrencyLimit(2)
+    running = []
+
+    async def work():
+        async with limit:
+            running.append(limit.running)
+            await sleep(0.01)
+
+    await gather(*(work() for _ in range(6)))
+
+    stats = limit.stats()
+    assert max(running) == 2
+    assert stats["calls"] == 6
+    assert stats["running"] == 0
+    assert stats["waiting"] == 0
+    assert stats["max_wait"] > 0
+
+
+def test_concurrency_limit_requires_positive_value():
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(0)
+
+
+@pytest.mark.asyncio
+async def test_limited_dependency_and_field():
+    builder = Builder()
+    running = {"dep": 0, "field": 0}
+    peaks = {"dep": 0, "field": 0}
+
+    async def track(name):
+        running[name] += 1
+        peaks[name] = max(peaks[name], running[name])
+        await sleep(0.01)
+        running[name] -= 1
+
+    async def call_api(parent, info):
+        await track("dep")
+        return parent
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def value(
+            parent, info, result=DependOn(call_api, max_concurrency=2)
+        ) -> int:
+            return result
+
+        @builder.field(max_concurrency=3)
+        async def double(parent, info) -> int:
+            await track("field")
+            return parent * 2
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return list(range(10))
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(
+        schema.execute_async("query Query { items { value double } }"), 5
+    )
+    assert not result.errors
+    assert result.data["items"][3] == {"value": 3, "double": 6}
+    assert peaks == {"dep": 2, "field": 3}
+
+    assert builder.limits[call_api].stats()["calls"] == 10
+
+
+def test_conflicting_limits_raise():
+    builder = Builder()
+
+    async def call_api(parent, info):
+        return 1
+
+    with pytest.raises(ValueError):
+
+        class Query(gpt.ObjectType):
+            @builder.field
+            async def a(parent, info, r=DependOn(call_api, max_concurrency=2)) -> int:
+                return r
+
+            @builder.field
+            async def b(parent, info, r=DependOn(call_api, max_concurrency=3)) -> int:
+                return r
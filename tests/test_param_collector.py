@@ -18,4 +18,4 @@ def test_collect_params():
     args, dep_funcs = interpret_params(resolver_to_test_dependon)
 
     assert sorted(args) == []
-    assert dep_funcs == {"dep": dep}
+    assert dep_funcs == {"dep": DependOn(dep)}
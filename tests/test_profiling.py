@@ -0,0 +1,65 @@
+from asyncio import wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn, Profiler
+from fast_graphene.profiling import ProfilingWarning
+
+
+def get_settings(parent, info):
+    return "settings"
+
+
+def get_owner(parent, info):
+    return f"owner{parent}"
+
+
+@pytest.fixture
+def schema():
+    builder = Builder(profiler=Profiler(threshold=5))
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        async def owner(
+            parent,
+            info,
+            owner=DependOn(get_owner),
+            settings=DependOn(get_settings),
+        ) -> str:
+            return owner
+
+    class Query(gpt.ObjectType):
+        items = gpt.List(Item)
+
+        def resolve_items(parent, info):
+            return list(range(10))
+
+    return builder, gpt.Schema(Query)
+
+
+@pytest.mark.asyncio
+async def test_profiler_finds_patterns(schema):
+    builder, schema = schema
+
+    with pytest.warns(ProfilingWarning):
+        with builder.profiler.operation() as profile:
+            result = await wait_for(
+                schema.execute_async("query Query { items { owner } }"), 5
+            )
+
+    assert not result.errors
+    assert profile.functions[get_owner].calls == 10
+    findings = {finding.func: finding.pattern for finding in profile.findings()}
+    assert findings == {get_owner: "n+1", get_settings: "redundant"}
+    assert "get_owner ran 10 times" in profile.report()
+
+
+@pytest.mark.asyncio
+async def test_profiler_records_nothing_outside_operation(schema):
+    builder, schema = schema
+
+    result = await wait_for(schema.execute_async("query Query { items { owner } }"), 5)
+
+    assert not result.errors
+    assert builder.profiler.current() is None
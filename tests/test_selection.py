@@ -0,0 +1,119 @@
+from asyncio import wait_for
+from typing import List
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn, get_selection, Selection
+from fast_graphene.selection import selection_of
+
+QUERY = """
+query ($withEmail: Boolean!) {
+  users {
+    id
+    ...Names
+    email @include(if: $withEmail)
+    posts(first: 2) {
+      title
+      ... on Post { body }
+    }
+  }
+}
+
+fragment Names on User {
+  name
+  nick: name
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_selection_dependency():
+    builder = Builder()
+    received: List[Selection] = []
+    post_selections = []
+
+    def load_users(parent, info, selection=DependOn(get_selection)):
+        received.append(selection)
+        return [1, 2, 3]
+
+    def get_post_selection(parent, info):
+        post_selections.append(selection_of(info))
+
+    class Post(gpt.ObjectType):
+        title = gpt.String()
+        body = gpt.String()
+
+    class User(gpt.ObjectType):
+        id = gpt.Int(resolver=lambda parent, info: parent)
+        name = gpt.String()
+        email = gpt.String()
+
+        @builder.field
+        async def posts(
+            parent, info, first: int, selection=DependOn(get_post_selection)
+        ) -> List[Post]:
+            return []
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def users(parent, info, users=DependOn(load_users)) -> List[User]:
+            return users
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(
+        schema.execute_async(QUERY, variable_values={"withEmail": False}), 5
+    )
+    assert not result.errors
+
+    (selection,) = received
+    assert selection.names == {"id", "name", "posts"}
+    assert set(selection.fields) == {"id", "name", "nick", "posts"}
+    assert selection.fields["nick"].alias == "nick"
+    posts = selection.get("posts")
+    assert posts.arguments == {"first": 2}
+    assert posts.selection.names == {"title", "body"}
+    assert "email" not in selection
+
+    # Made once and shared by every row of the list.
+    assert len(post_selections) == 3
+    assert len(set(map(id, post_selections))) == 1
+    assert post_selections[0].names == {"title", "body"}
+
+    result = await wait_for(
+        schema.execute_async(QUERY, variable_values={"withEmail": True}), 5
+    )
+    assert not result.errors
+    assert "email" in received[-1]
+
+
+@pytest.mark.asyncio
+async def test_selection_python_names():
+    builder = Builder()
+    received: List[Selection] = []
+
+    def load_user(parent, info, selection=DependOn(get_selection)):
+        received.append(selection)
+        return {}
+
+    class User(gpt.ObjectType):
+        first_name = gpt.String()
+        last_login_at = gpt.String(name="lastSeen")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def user(parent, info, user=DependOn(load_user)) -> User:
+            return user
+
+    for auto_camelcase, query in [
+        (True, "{ user { firstName given: firstName lastSeen __typename } }"),
+        (False, "{ user { first_name given: first_name lastSeen __typename } }"),
+    ]:
+        schema = gpt.Schema(Query, auto_camelcase=auto_camelcase)
+        result = await wait_for(schema.execute_async(query), 5)
+        assert not result.errors
+
+        selection = received[-1]
+        assert selection.python_names == {"first_name", "last_login_at", "__typename"}
+        assert selection.fields["given"].python_name == "first_name"
+        assert "lastSeen" in selection
@@ -0,0 +1,111 @@
+from asyncio import create_task, sleep, wait_for
+from typing import AsyncIterator
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn
+from fast_graphene.subscriptions import EventBuffer
+
+
+@pytest.mark.asyncio
+async def test_subscription_resolves_dependencies_once():
+    builder = Builder()
+    events = []
+
+    async def connection(parent, info):
+        events.append("open")
+        yield "connection"
+        events.append("close")
+
+    class Query(gpt.ObjectType):
+        ping = gpt.String()
+
+    class Subscription(gpt.ObjectType):
+        @builder.subscription
+        async def count(
+            parent, info, up_to: int, conn=DependOn(connection)
+        ) -> AsyncIterator[int]:
+            for i in range(up_to):
+                assert conn == "connection"
+                yield i
+
+    schema = gpt.Schema(query=Query, subscription=Subscription)
+    stream = await schema.subscribe("subscription { count(upTo: 3) }")
+    results = [result async for result in stream]
+    assert [result.data["count"] for result in results] == [0, 1, 2]
+    assert events == ["open", "close"]
+
+    events.clear()
+    stream = await schema.subscribe("subscription { count(upTo: 100) }")
+    result = await wait_for(stream.__anext__(), 5)
+    assert result.data == {"count": 0}
+    await stream.aclose()
+    assert events == ["open", "close"]
+
+
+@pytest.mark.asyncio
+async def test_buffered_subscription():
+    builder = Builder()
+    produced = []
+
+    class Query(gpt.ObjectType):
+        ping = gpt.String()
+
+    class Subscription(gpt.ObjectType):
+        @builder.subscription(buffer_size=2, overflow="coalesce")
+        async def price(parent, info) -> AsyncIterator[int]:
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+    schema = gpt.Schema(query=Query, subscription=Subscription)
+    stream = await schema.subscribe("subscription { price }")
+    first = await wait_for(stream.__anext__(), 5)
+    await sleep(0.01)  # Producer runs ahead of the slow subscriber.
+    rest = [result.data["price"] async for result in stream]
+
+    assert first.data == {"price": 0}
+    assert produced == list(range(10))
+    assert rest[-1] == 9 and len(rest) <= 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [
+        ("drop_oldest", [2, 3]),
+        ("drop_newest", [0, 1]),
+        ("coalesce", [0, 3]),
+    ],
+)
+async def test_event_buffer_overflow(overflow, expected):
+    buffer = EventBuffer(2, overflow)
+    for i in range(4):
+        await buffer.put(i)
+
+    assert [await buffer.get(), await buffer.get()] == expected
+    assert buffer.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_event_buffer_blocks():
+    buffer = EventBuffer(1, "block")
+    await buffer.put(0)
+    task = create_task(buffer.put(1))
+    await sleep(0)
+    assert not task.done()
+
+    assert await buffer.get() == 0
+    await wait_for(task, 1)
+    assert await buffer.get() == 1
+
+
+def test_subscription_must_be_async_generator():
+    builder = Builder()
+
+    async def count(parent, info) -> int:
+        return 1
+
+    with pytest.raises(TypeError):
+        builder.subscription(count)
@@ -0,0 +1,97 @@
+from typing import List
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn, Profiler, TeardownPolicy
+
+
+def test_sync_builder_executes_without_event_loop():
+    builder = Builder(sync=True)
+    calls = []
+
+    def get_base(parent, info, base: int = 10):
+        calls.append("setup")
+        yield base
+        calls.append("teardown")
+
+    def get_offset(parent, info, base=DependOn(get_base)) -> int:
+        return base + parent
+
+    class Item(gpt.ObjectType):
+        @builder.field
+        def value(parent, info, scale: int = 1, offset=DependOn(get_offset)) -> int:
+            return offset * scale
+
+        @builder.field
+        def raw(parent, info) -> int:
+            return parent
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        def items(parent, info) -> List[Item]:
+            return [1, 2]
+
+    schema = gpt.Schema(Query)
+    result = schema.execute("{ items { raw value(scale: 2) } }")
+    assert not result.errors
+    assert result.data == {"items": [{"raw": 1, "value": 22}, {"raw": 2, "value": 24}]}
+    assert calls == ["setup", "teardown"] * 2
+
+
+def test_sync_builder_profiles_resolvers():
+    profiler = Profiler()
+    builder = Builder(sync=True, profiler=profiler)
+
+    def get_one(parent, info) -> int:
+        return 1
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        def one(parent, info, one=DependOn(get_one)) -> int:
+            return one
+
+    schema = gpt.Schema(Query)
+    with profiler.operation() as profile:
+        result = schema.execute("{ a: one b: one }")
+    assert not result.errors
+    assert {function.kind for function in profile.functions.values()} == {
+        "resolver",
+        "dependency",
+    }
+
+
+def test_sync_builder_rejects_async():
+    builder = Builder(sync=True)
+
+    async def get_user(parent, info):
+        return "user"
+
+    with pytest.raises(TypeError):
+
+        @builder.field
+        async def resolve_async(parent, info) -> str:
+            return "value"
+
+    with pytest.raises(TypeError):
+
+        @builder.field
+        def resolve_user(parent, info, user=DependOn(get_user)) -> str:
+            return user
+
+    with pytest.raises(TypeError):
+
+        @builder.field
+        def resolve_shared(
+            parent, info, user=DependOn(lambda parent, info: 1, scope="request")
+        ) -> str:
+            return user
+
+    with pytest.raises(ValueError):
+
+        @builder.field(timeout=1)
+        def resolve_timeout(parent, info) -> str:
+            return "value"
+
+    with pytest.raises(ValueError):
+        Builder(sync=True, teardown=TeardownPolicy("deferred"))
@@ -0,0 +1,124 @@
+from asyncio import Event, wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn, RequestScope, TeardownPolicy
+
+
+def make_schema(teardown: TeardownPolicy, calls: list, released: Event):
+    builder = Builder(teardown=teardown)
+
+    async def get_session(parent, info):
+        calls.append("setup")
+        yield "session"
+        await released.wait()
+        calls.append("teardown")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, session=DependOn(get_session)) -> str:
+            return session
+
+    return gpt.Schema(Query)
+
+
+@pytest.mark.asyncio
+async def test_async_generator_dependency_inline():
+    calls = []
+    released = Event()
+    released.set()
+    schema = make_schema(TeardownPolicy(), calls, released)
+
+    result = await wait_for(schema.execute_async("query Query { test }"), 5)
+
+    assert not result.errors
+    assert result.data["test"] == "session"
+    assert calls == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_deferred_teardown():
+    calls = []
+    released = Event()
+    teardown = TeardownPolicy("deferred", max_concurrency=1)
+    schema = make_schema(teardown, calls, released)
+
+    result = await wait_for(schema.execute_async("query Query { test }"), 5)
+
+    assert not result.errors
+    assert calls == ["setup"]
+    released.set()
+    await wait_for(teardown.drain(), 5)
+    assert calls == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_operation_teardown():
+    calls = []
+    released = Event()
+    released.set()
+    schema = make_schema(TeardownPolicy("operation"), calls, released)
+
+    async with RequestScope() as scope:
+        result = await wait_for(
+            schema.execute_async(
+                "query Query { test }", context_value={"request_scope": scope}
+            ),
+            5,
+        )
+        assert calls == ["setup"]
+
+    assert not result.errors
+    assert calls == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_deferred_teardown_reports_errors():
+    errors = []
+    teardown = TeardownPolicy("deferred", on_error=errors.append)
+    builder = Builder(teardown=teardown)
+
+    def get_session(parent, info):
+        yield "session"
+        raise ValueError
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, session=DependOn(get_session)) -> str:
+            return session
+
+    result = await wait_for(gpt.Schema(Query).execute_async("query Query { test }"), 5)
+    await wait_for(teardown.drain(), 5)
+
+    assert not result.errors
+    assert [type(error) for error in errors] == [ValueError]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_deferred_teardown():
+    calls = []
+    released = Event()
+    teardown = TeardownPolicy("deferred")
+    builder = Builder(teardown=teardown)
+
+    async def get_session(parent, info):
+        calls.append("setup")
+        yield "session"
+        await released.wait()
+        calls.append("teardown")
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        async def test(parent, info, session=DependOn(get_session)) -> str:
+            return session
+
+    async with builder.lifespan():
+        result = await wait_for(
+            gpt.Schema(Query).execute_async("query Query { test }"), 5
+        )
+        assert calls == ["setup"]
+        released.set()
+
+    assert not result.errors
+    assert calls == ["setup", "teardown"]
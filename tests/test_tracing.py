@@ -0,0 +1,73 @@
+from asyncio import wait_for
+
+import pytest
+from graphene import types as gpt
+
+from fast_graphene import Builder, DependOn, Tracer
+from fast_graphene.tracing import InMemorySink, OpenTelemetrySink
+
+
+def get_session(parent, info):
+    yield "session"
+
+
+@pytest.mark.asyncio
+async def test_tracer_emits_spans():
+    sink = InMemorySink()
+    builder = Builder(tracer=Tracer(sink))
+
+    class Query(gpt.ObjectType):
+        @builder.field
+        def test(parent, info, session=DependOn(get_session)) -> str:
+            return session
+
+    schema = gpt.Schema(Query)
+    result = await wait_for(schema.execute_async("query Query { test }"), 5)
+
+    assert not result.errors
+    kinds = [span.kind for span in sink.spans]
+    assert sorted(kinds) == ["dependency", "executor", "field", "resolver", "teardown"]
+    assert kinds[-1] == "field"
+    (field,) = sink.by_kind("field")
+    assert field.attributes["field_name"] == "test"
+    assert field.attributes["parent_type"] == "Query"
+    assert sink.by_kind("dependency")[0].attributes["function"] == "get_session"
+    assert all(span.duration_ns >= 0 for span in sink.spans)
+
+
+class FakeSpan:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.ended = False
+        self.exceptions = []
+
+    def record_exception(self, exc):
+        self.exceptions.append(exc)
+
+    def end(self):
+        self.ended = True
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        self.spans.append(FakeSpan(name, attributes))
+        return self.spans[-1]
+
+
+def test_open_telemetry_sink():
+    otel_tracer = FakeTracer()
+    tracer = Tracer(OpenTelemetrySink(otel_tracer))
+
+    with pytest.raises(ValueError):
+        with tracer.span("dependency", get_session):
+            raise ValueError
+
+    (span,) = otel_tracer.spans
+    assert span.name == "dependency get_session"
+    assert span.attributes["graphql.function"] == "get_session"
+    assert span.ended
+    assert isinstance(span.exceptions[0], ValueError)